@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 try:  # Python 3.11+
     from importlib.metadata import PackageNotFoundError, version as _dist_version
@@ -14,6 +18,11 @@ except Exception:  # pragma: no cover - fallback for older environments
         PackageNotFoundError = Exception  # type: ignore
 
 
+_PROJECT_VERSION_RE = re.compile(
+    rb"^\[project\][^\[]*?^version\s*=\s*[\"']([^\"']+)[\"']", re.MULTILINE | re.DOTALL
+)
+
+
 def _read_local_pyproject_version() -> str | None:
     """Attempt to read version from local pyproject when running from source.
 
@@ -24,14 +33,25 @@ def _read_local_pyproject_version() -> str | None:
     if not pyproject_path.exists():
         return None
 
+    try:
+        raw = pyproject_path.read_bytes()
+    except OSError:
+        return None
+
+    # Fast path: pick `version` out of the [project] table without a TOML parser
+    match = _PROJECT_VERSION_RE.search(raw)
+    if match:
+        version = match.group(1).decode("utf-8", "replace").strip()
+        if version:
+            return version
+
     try:
         try:
             import tomllib  # Python 3.11+
         except Exception:  # pragma: no cover
             import tomli as tomllib  # type: ignore
 
-        with pyproject_path.open("rb") as f:
-            data = tomllib.load(f)
+        data = tomllib.loads(raw.decode("utf-8"))
         project = data.get("project", {}) if isinstance(data, dict) else {}
         version = project.get("version")
         if isinstance(version, str) and version.strip():
@@ -41,6 +61,7 @@ def _read_local_pyproject_version() -> str | None:
     return None
 
 
+@lru_cache(maxsize=1)
 def _resolve_version() -> str:
     # Prefer installed distribution metadata when available
     try:
@@ -61,8 +82,28 @@ def _resolve_version() -> str:
 
 __version__: str = _resolve_version()
 
-from spoon_ai.chat import ChatBot 
-from spoon_ai.schema import LLMResponse, LLMResponseChunk, Message 
+if TYPE_CHECKING:
+    from spoon_ai.chat import ChatBot
+    from spoon_ai.schema import LLMResponse, LLMResponseChunk, Message
+
+# Public names resolved on first access so `import spoon_ai` (e.g. for
+# __version__) does not pull in every LLM provider SDK.
+_LAZY_ATTRS = {
+    "ChatBot": "spoon_ai.chat",
+    "Message": "spoon_ai.schema",
+    "LLMResponse": "spoon_ai.schema",
+    "LLMResponseChunk": "spoon_ai.schema",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "__version__",
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Set, Tuple, Union
 import asyncio
 
 from pydantic import Field
@@ -48,6 +48,20 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
     output_topic: Optional[str] = None
     mcp_enabled: bool = True
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        assert hasattr(self.available_tools, 'tools') and hasattr(self.available_tools, 'tool_map'), \
+            "available_tools must expose 'tools' and 'tool_map'"
+        # Incremental validation state: names of invalid tools and the
+        # (manager, version) pair they were computed for
+        self._invalid_tool_names: Set[str] = set()
+        self._validated_tools_key: Optional[Tuple[int, int]] = None
+
+    def _tools_key(self) -> Tuple[int, int]:
+        manager = self.available_tools
+        # Anything other than a ToolManager only has its size to go by
+        return (id(manager), getattr(manager, 'version', len(manager.tools)))
+
     def add_tool(self, tool: BaseTool) -> None:
         """
         Add a tool to the agent with validation.
@@ -64,23 +78,17 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
         if not hasattr(tool, 'name') or not tool.name:
             raise ValueError("Tool must have a valid name")
         
+        in_sync = self._validated_tools_key == self._tools_key()
+
         # Check for duplicate tool names
-        existing_names = self.list_tools()
-        if tool.name in existing_names:
+        if tool.name in self.available_tools.tool_map:
             logger.warning(f"Tool '{tool.name}' already exists, replacing it")
             self.remove_tool(tool.name)
         
         try:
-            # ToolManager uses tools list, not add_tool method
-            if not hasattr(self.available_tools, 'tools'):
-                self.available_tools.tools = []
-            
-            self.available_tools.tools.append(tool)
-            
-            # Update tool_map if it exists
-            if hasattr(self.available_tools, 'tool_map'):
-                self.available_tools.tool_map[tool.name] = tool
+            self.available_tools.add_tool(tool)
             
+            self._mark_tools_changed([tool.name], in_sync=in_sync)
             logger.info(f"Added tool: {tool.name} (total: {len(self.available_tools.tools)})")
             
         except Exception as e:
@@ -111,6 +119,18 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
             if not hasattr(tool, 'name') or not tool.name:
                 raise ValueError(f"Tool at index {i} must have a valid name")
         
+        # Fast path: no name collisions, so extend the manager in one go
+        new_names = {tool.name for tool in tools}
+        tool_map = self.available_tools.tool_map
+        if len(new_names) == len(tools) and new_names.isdisjoint(tool_map):
+            in_sync = self._validated_tools_key == self._tools_key()
+            self.available_tools.tools.extend(tools)
+            tool_map.update({tool.name: tool for tool in tools})
+            self.available_tools.mark_dirty()
+            self._mark_tools_changed(new_names, in_sync=in_sync)
+            logger.info(f"Added {len(tools)} tools (total: {len(self.available_tools.tools)})")
+            return
+
         # Add all tools (will handle duplicates individually)
         added_count = 0
         for tool in tools:
@@ -137,24 +157,30 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
             logger.error("Tool name must be a non-empty string")
             return False
         
+        in_sync = self._validated_tools_key == self._tools_key()
+
         try:
-            # Find and remove from tools list
-            if hasattr(self.available_tools, 'tools'):
-                original_count = len(self.available_tools.tools)
+            # Locate the tool through tool_map and pop it from the list in place
+            tool = self.available_tools.tool_map.pop(tool_name, None)
+            tools = self.available_tools.tools
+            if tool is not None:
+                removed = True
+                for index, candidate in enumerate(tools):
+                    if candidate is tool:
+                        tools.pop(index)
+                        break
+            else:
+                # tool_map out of sync (e.g. renamed tool); fall back to a name scan
+                original_count = len(tools)
                 self.available_tools.tools = [
-                    tool for tool in self.available_tools.tools 
-                    if getattr(tool, 'name', '') != tool_name
+                    candidate for candidate in tools
+                    if getattr(candidate, 'name', '') != tool_name
                 ]
                 removed = len(self.available_tools.tools) < original_count
-            else:
-                removed = False
-            
-            # Remove from tool_map if it exists
-            if hasattr(self.available_tools, 'tool_map') and tool_name in self.available_tools.tool_map:
-                del self.available_tools.tool_map[tool_name]
-                removed = True
             
             if removed:
+                self.available_tools.mark_dirty()
+                self._mark_tools_changed([tool_name], in_sync=in_sync)
                 logger.info(f"Removed tool: {tool_name} (remaining: {len(self.available_tools.tools)})")
                 return True
             else:
@@ -165,6 +191,18 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
             logger.error(f"Error removing tool {tool_name}: {e}")
             return False
 
+    def _mark_tools_changed(self, names, in_sync: bool) -> None:
+        """Record tools added or removed through this agent as valid.
+
+        Tools that pass through add_tool/remove_tool are already validated, so
+        the cached report only needs their names dropped. If the manager was
+        changed behind our back beforehand, leave the cache stale so the next
+        run does a full validation.
+        """
+        self._invalid_tool_names.difference_update(names)
+        if in_sync:
+            self._validated_tools_key = self._tools_key()
+
     def list_tools(self) -> List[str]:
         """
         List all available tools in the agent.
@@ -173,9 +211,7 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
             List of tool names, empty list if no tools
         """
         try:
-            if hasattr(self.available_tools, 'tools') and self.available_tools.tools:
-                return [getattr(tool, 'name', 'unnamed') for tool in self.available_tools.tools]
-            return []
+            return [getattr(tool, 'name', 'unnamed') for tool in self.available_tools.tools]
         except Exception as e:
             logger.error(f"Error listing tools: {e}")
             return []
@@ -189,17 +225,16 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
         """
         tool_info = {}
         try:
-            if hasattr(self.available_tools, 'tools'):
-                for tool in self.available_tools.tools:
-                    if hasattr(tool, 'name'):
-                        tool_info[tool.name] = {
-                            'description': getattr(tool, 'description', 'No description'),
-                            'parameters': getattr(tool, 'parameters', {}),
-                            'type': type(tool).__name__
-                        }
+            for tool in self.available_tools.tools:
+                if hasattr(tool, 'name'):
+                    tool_info[tool.name] = {
+                        'description': getattr(tool, 'description', 'No description'),
+                        'parameters': getattr(tool, 'parameters', {}),
+                        'type': type(tool).__name__
+                    }
         except Exception as e:
             logger.error(f"Error getting tool info: {e}")
-        
+
         return tool_info
 
     def validate_tools(self) -> Dict[str, Any]:
@@ -217,10 +252,6 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
         }
         
         try:
-            if not hasattr(self.available_tools, 'tools'):
-                report['issues'].append("ToolManager missing 'tools' attribute")
-                return report
-            
             report['total_tools'] = len(self.available_tools.tools)
             
             for tool in self.available_tools.tools:
@@ -262,11 +293,15 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
         Returns:
             Processing result
         """
-        # Validate tools before running
-        validation = self.validate_tools()
-        if validation['invalid_tools']:
-            logger.error(f"Cannot run agent with invalid tools: {validation['invalid_tools']}")
-            raise RuntimeError(f"Agent has invalid tools: {', '.join(validation['invalid_tools'])}")
+        # Fully validate only when the tool manager changed outside add/remove
+        if self._validated_tools_key != self._tools_key():
+            validation = self.validate_tools()
+            self._invalid_tool_names = set(validation['invalid_tools'])
+            self._validated_tools_key = self._tools_key()
+        if self._invalid_tool_names:
+            invalid_tools = sorted(self._invalid_tool_names)
+            logger.error(f"Cannot run agent with invalid tools: {invalid_tools}")
+            raise RuntimeError(f"Agent has invalid tools: {', '.join(invalid_tools)}")
         
         if self.state != AgentState.IDLE:
             self.clear()
@@ -288,13 +323,6 @@ When you need to use tools, please use the provided tool API. Don't pretend to c
             if hasattr(self, attr):
                 delattr(self, attr)
         
-        # Validate tool manager state after clear
-        try:
-            if hasattr(self.available_tools, 'tools'):
-                logger.debug(f"Agent cleared with {len(self.available_tools.tools)} tools remaining")
-            else:
-                logger.warning("ToolManager missing 'tools' attribute after clear")
-        except Exception as e:
-            logger.error(f"Error checking tools after clear: {e}")
+        logger.debug(f"Agent cleared with {len(self.available_tools.tools)} tools remaining")
         
         logger.debug(f"CustomAgent '{self.name}' fully cleared and validated")
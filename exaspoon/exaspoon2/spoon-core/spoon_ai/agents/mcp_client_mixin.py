@@ -1,34 +1,74 @@
-import time
+import json
+import weakref
+from contextvars import ContextVar
 from typing import Union, Dict, Any, Optional, List, AsyncIterator, AsyncContextManager
 import asyncio
 from contextlib import asynccontextmanager
 from fastmcp.client import Client as MCPClient
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+_COROUTINE_MARKER = "<coroutine object"
+# Beyond this size a payload is real tool output, not a bare coroutine repr
+_COROUTINE_SCAN_LIMIT = 4096
+
+# Session leased in the current context, per client: id(client) -> session info.
+# A single module-level var, since ContextVars are never garbage-collected.
+_SESSION_CTX: ContextVar[Optional[Dict[int, Dict[str, Any]]]] = ContextVar("mcp_session", default=None)
+
+
+def _looks_like_coroutine_repr(text: str) -> bool:
+    """Detect a FastMCP async tool that returned its coroutine instead of a result."""
+    return text.startswith(_COROUTINE_MARKER) or (
+        len(text) < _COROUTINE_SCAN_LIMIT and _COROUTINE_MARKER in text
+    )
+
+
+class _SessionStats:
+    """Session lifecycle counters kept as plain slot attributes."""
+
+    __slots__ = ("created", "closed", "failed", "active")
+
+    def __init__(self):
+        self.created = self.closed = self.failed = self.active = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
 class MCPClientMixin:
     def __init__(self, mcp_transport):
+        self._mcp_transport = mcp_transport
         self._client = MCPClient(mcp_transport)
         self._last_sender = None
         self._last_topic = None
         self._last_message_id = None
 
-        # Enhanced session management
-        self._session_lock = asyncio.Lock()
-        self._task_sessions = {}
-        self._session_count = 0
+        # Enhanced session management: the current context's session is found
+        # through _SESSION_CTX (no task lookup on reuse), active sessions are
+        # tracked per task (reaped by GC once the task is gone) and a
+        # semaphore caps how many can be open at once.
+        self._task_sessions: "weakref.WeakKeyDictionary[asyncio.Task, Dict[str, Any]]" = weakref.WeakKeyDictionary()
         self._max_concurrent_sessions = 10  
+        self._session_slots = asyncio.Semaphore(self._max_concurrent_sessions)
+        # One long-lived MCP connection shared by every task; per-task entries
+        # above only lease it. Callers must not close the shared session.
+        self._shared_session = None
+        self._connect_lock = asyncio.Lock()
         self._cleanup_interval = 300  
-        self._last_cleanup = time.time()
+        self._reaper_handle: Optional[asyncio.TimerHandle] = None
+        self._loop_time = None
+        self._reaper_task: Optional[asyncio.Task] = None
+        # Event loop the connection, lock, semaphore and reaper belong to
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Finished tasks whose leases the reaper still has to release; held
+        # weakly, like _task_sessions, so a finished task is not kept alive
+        self._pending_cleanup: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
         
         # Track session metrics for monitoring
-        self._session_stats = {
-            "created": 0,
-            "closed": 0,
-            "failed": 0,
-            "active": 0
-        }
+        self._session_stats = _SessionStats()
 
     @asynccontextmanager
     async def get_session(self):
@@ -41,151 +81,226 @@ class MCPClientMixin:
         - Proper cleanup on cancellation/failure
         - Periodic cleanup of stale sessions
         """
+        # Reuse the session leased in this context. Child tasks inherit the
+        # context and may share the lease: every lease is on the same shared
+        # connection, and a released lease is marked closed below.
+        leases = _SESSION_CTX.get()
+        session_info = leases.get(id(self)) if leases else None
+        # The session check guards against a lease left by a collected client
+        # whose id has been reused
+        if (session_info is not None and session_info["session"] is not None
+                and session_info["session"] is self._shared_session and not session_info["closed"]):
+            try:
+                session_info["last_accessed"] = self._now()
+                yield session_info["session"]
+                return
+            except Exception as e:
+                logger.warning(f"Existing session for task {session_info['task_id']} failed: {e}")
+                # Mark as closed and continue to create new session
+                session_info["closed"] = True
+
         current_task = asyncio.current_task()
         if current_task is None:
             raise RuntimeError("MCPClientMixin.get_session() must be called from within an async task")
-            
+
         task_id = id(current_task)
-        
-        # Periodic cleanup of stale sessions
-        await self._cleanup_stale_sessions()
-        
-        # Check if current task already has a session
-        if task_id in self._task_sessions:
-            session_info = self._task_sessions[task_id]
-            if session_info["session"] and not session_info.get("closed", False):
-                try:
-                    session_info["last_accessed"] = time.time()
-                    yield session_info["session"]
-                    return
-                except Exception as e:
-                    logger.warning(f"Existing session for task {task_id} failed: {e}")
-                    # Mark as closed and continue to create new session
-                    session_info["closed"] = True
+        self._bind_to_running_loop()
+
+        # Periodic cleanup of stale sessions runs on a loop timer, off this path
+        if self._reaper_handle is None:
+            self._start_reaper()
 
         # Create new session with resource limits
-        async with self._session_lock:
-            # Check session limits
-            if self._session_count >= self._max_concurrent_sessions:
-                # Try to cleanup stale sessions first
-                await self._force_cleanup_stale_sessions()
-                
-                if self._session_count >= self._max_concurrent_sessions:
-                    raise RuntimeError(f"Maximum concurrent sessions ({self._max_concurrent_sessions}) reached")
-            
-            session = None
-            session_info = None
-            
-            try:
-                # Create new session
-                session = await self._client.__aenter__()
-                current_time = time.time()
-                
-                session_info = {
-                    "session": session,
-                    "created_at": current_time,
-                    "last_accessed": current_time,
-                    "task_id": task_id,
-                    "closed": False
-                }
-                
-                self._task_sessions[task_id] = session_info
-                self._session_count += 1
-                self._session_stats["created"] += 1
-                self._session_stats["active"] += 1
-                
-                logger.debug(f"Created MCP session for task {task_id} (total: {self._session_count})")
-                
-                # Register cleanup callback for task cancellation
-                current_task.add_done_callback(
-                    lambda t: asyncio.create_task(self._cleanup_task_session(task_id))
-                )
-                
-                yield session
-                
-            except asyncio.CancelledError:
-                logger.info(f"Session creation cancelled for task {task_id}")
-                await self._cleanup_session(task_id, session_info, session)
-                raise
-            except Exception as e:
-                logger.error(f"Failed to create MCP session for task {task_id}: {e}")
-                self._session_stats["failed"] += 1
-                await self._cleanup_session(task_id, session_info, session)
-                raise
-            finally:
-                # Always attempt cleanup on context exit
-                await self._cleanup_session(task_id, session_info, session)
-
-    async def _cleanup_session(self, task_id: int, session_info: Optional[Dict], session: Optional[Any]):
-        """Clean up a specific session with proper error handling."""
+        if self._session_slots.locked():
+            # Try to cleanup stale sessions first
+            await self._force_cleanup_stale_sessions()
+
+            if self._session_slots.locked():
+                raise RuntimeError(f"Maximum concurrent sessions ({self._max_concurrent_sessions}) reached")
+
+        await self._session_slots.acquire()
+        session = None
+        session_info = None
+
+        try:
+            # Lease the shared connection, opening it on first use
+            session = await self._ensure_shared_session()
+            current_time = self._now()
+
+            session_info = {
+                "session": session,
+                "created_at": current_time,
+                "last_accessed": current_time,
+                "task_id": task_id,
+                "closed": False
+            }
+
+            self._task_sessions[current_task] = session_info
+            # Copy rather than update: the dict may be shared with other contexts
+            _SESSION_CTX.set({**leases, id(self): session_info} if leases else {id(self): session_info})
+            self._session_stats.created += 1
+            self._session_stats.active += 1
+
+            logger.debug(f"Created MCP session for task {task_id} (total: {len(self._task_sessions)})")
+
+            # Flag the task for the reaper when it finishes or is cancelled
+            current_task.add_done_callback(self._mark_for_cleanup)
+
+            yield session
+
+        except asyncio.CancelledError:
+            logger.info(f"Session creation cancelled for task {task_id}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to create MCP session for task {task_id}: {e}")
+            self._session_stats.failed += 1
+            raise
+        finally:
+            # Release the lease exactly once; the shared connection stays open
+            await self._cleanup_session(current_task, session_info, session)
+            if session_info is None:
+                # Session never got registered, so give its slot back here
+                self._session_slots.release()
+
+    async def _ensure_shared_session(self):
+        """Return the shared MCP session, connecting once if needed."""
+        session = self._shared_session
+        if session is not None and self._client.is_connected():
+            return session
+
+        async with self._connect_lock:
+            if self._shared_session is not None and self._client.is_connected():
+                return self._shared_session
+            if self._shared_session is not None:
+                # Connection dropped underneath us; release it before reconnecting
+                await self._close_shared_session()
+            self._shared_session = await self._client.__aenter__()
+            logger.debug("Opened shared MCP connection")
+            return self._shared_session
+
+    async def _close_shared_session(self) -> None:
+        """Close the shared MCP connection if it is open."""
+        if self._shared_session is None:
+            return
+        self._shared_session = None
+        try:
+            await self._client.__aexit__(None, None, None)
+            logger.debug("Closed shared MCP connection")
+        except Exception as e:
+            logger.error(f"Error closing shared MCP connection: {e}")
+            self._session_stats.failed += 1
+
+    async def _cleanup_session(self, task: asyncio.Task, session_info: Optional[Dict], session: Optional[Any]):
+        """Release a task's lease on the shared session with proper error handling."""
+        task_id = id(task)
         try:
             if session_info and not session_info.get("closed", False):
                 session_info["closed"] = True
-                
+
             if session:
-                try:
-                    await self._client.__aexit__(None, None, None)
-                    self._session_stats["closed"] += 1
-                    logger.debug(f"Successfully closed MCP session for task {task_id}")
-                except Exception as e:
-                    logger.error(f"Error closing MCP session for task {task_id}: {e}")
-                    self._session_stats["failed"] += 1
+                # The connection itself stays open for other tasks
+                self._session_stats.closed += 1
+                logger.debug(f"Released MCP session for task {task_id}")
         except Exception as e:
             logger.error(f"Error during session cleanup for task {task_id}: {e}")
         finally:
-            # Always remove from tracking
-            if task_id in self._task_sessions:
-                del self._task_sessions[task_id]
-                self._session_count = max(0, self._session_count - 1)
-                self._session_stats["active"] = max(0, self._session_stats["active"] - 1)
-
-    async def _cleanup_task_session(self, task_id: int):
-        """Cleanup callback for when a task completes or is cancelled."""
-        if task_id in self._task_sessions:
-            session_info = self._task_sessions[task_id]
-            await self._cleanup_session(task_id, session_info, session_info.get("session"))
+            # Always remove from tracking and free the session slot
+            if self._task_sessions.pop(task, None) is not None:
+                self._session_slots.release()
+                # Paired with the increment when the entry was registered
+                self._session_stats.active -= 1
+
+    def _mark_for_cleanup(self, task: asyncio.Task) -> None:
+        """Done callback: queue a finished task's lease for the reaper."""
+        # Looked up on each call, so it always reaches the live set
+        self._pending_cleanup.add(task)
+
+    async def _drain_pending_cleanup(self):
+        """Release leases still held by tasks that have since finished."""
+        if not self._pending_cleanup:
+            return
+        # Drained in place: the set is never swapped out from under callers
+        pending = list(self._pending_cleanup)
+        self._pending_cleanup.clear()
+        for task in pending:
+            session_info = self._task_sessions.get(task)
+            if session_info is not None:
+                await self._cleanup_session(task, session_info, session_info.get("session"))
+
+    def _bind_to_running_loop(self) -> None:
+        """Reset loop-bound state when used from a new event loop.
+
+        The shared connection, the lock, the semaphore and the reaper timer
+        all belong to the loop that created them; after e.g. a second
+        ``asyncio.run`` none of them is usable, and the old loop can no
+        longer close the connection, so it is simply dropped.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.debug("MCP client moved to a new event loop; resetting session state")
+            if self._reaper_handle is not None:
+                self._reaper_handle.cancel()
+            self._reaper_handle = None
+            self._reaper_task = None
+            self._task_sessions.clear()
+            self._pending_cleanup.clear()
+            self._session_stats.active = 0
+            self._shared_session = None
+            self._client = MCPClient(self._mcp_transport)
+            self._connect_lock = asyncio.Lock()
+            self._session_slots = asyncio.Semaphore(self._max_concurrent_sessions)
+        self._loop = loop
+        self._loop_time = loop.time
+
+    def _now(self) -> float:
+        """Monotonic timestamp from the running event loop's clock."""
+        if self._loop_time is None:
+            self._loop_time = asyncio.get_running_loop().time
+        return self._loop_time()
+
+    def _start_reaper(self) -> None:
+        """Arm the timer that periodically reaps stale sessions."""
+        loop = asyncio.get_running_loop()
+        self._reaper_handle = loop.call_later(self._cleanup_interval, self._reap)
+
+    def _reap(self) -> None:
+        """Timer callback: schedule a stale-session scan and re-arm."""
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._cleanup_stale_sessions())
+        self._start_reaper()
 
     async def _cleanup_stale_sessions(self):
         """Periodic cleanup of stale sessions."""
-        current_time = time.time()
-        
-        # Only run cleanup periodically
-        if current_time - self._last_cleanup < self._cleanup_interval:
-            return
-            
-        self._last_cleanup = current_time
+        await self._drain_pending_cleanup()
+        current_time = self._now()
         stale_threshold = current_time - 600  # 10 minutes
         
         stale_tasks = []
-        for task_id, session_info in self._task_sessions.items():
+        for task, session_info in self._task_sessions.items():
             if (session_info.get("last_accessed", 0) < stale_threshold or 
                 session_info.get("closed", False)):
-                stale_tasks.append(task_id)
+                stale_tasks.append(task)
         
-        for task_id in stale_tasks:
-            logger.info(f"Cleaning up stale MCP session for task {task_id}")
-            session_info = self._task_sessions.get(task_id)
+        for task in stale_tasks:
+            logger.info(f"Cleaning up stale MCP session for task {id(task)}")
+            session_info = self._task_sessions.get(task)
             if session_info:
-                await self._cleanup_session(task_id, session_info, session_info.get("session"))
+                await self._cleanup_session(task, session_info, session_info.get("session"))
 
     async def _force_cleanup_stale_sessions(self):
         """Force cleanup of all stale sessions when hitting limits."""
-        current_time = time.time()
+        await self._drain_pending_cleanup()
+        current_time = self._now()
         stale_threshold = current_time - 300  # 5 minutes for forced cleanup
         
-        stale_tasks = []
-        for task_id, session_info in self._task_sessions.items():
-            if (session_info.get("last_accessed", 0) < stale_threshold or 
-                session_info.get("closed", False)):
-                stale_tasks.append(task_id)
-        
+        # Single pass: capture each stale entry's info and session once
         cleanup_tasks = [
-            self._cleanup_session(
-                task_id, 
-                self._task_sessions.get(task_id), 
-                self._task_sessions.get(task_id, {}).get("session")
-            )
-            for task_id in stale_tasks
+            self._cleanup_session(task, session_info, session_info.get("session"))
+            for task, session_info in self._task_sessions.items()
+            if (session_info.get("last_accessed", 0) < stale_threshold or
+                session_info.get("closed", False))
         ]
         
         if cleanup_tasks:
@@ -211,21 +326,24 @@ class MCPClientMixin:
                     if hasattr(item, 'text') and item.text is not None:
                         text = item.text
                         # Check if the text indicates a coroutine object (FastMCP async tool issue)
-                        if "<coroutine object" in text and "at 0x" in text:
+                        if _looks_like_coroutine_repr(text):
                             # This indicates the MCP server returned a coroutine object instead of executing it
                             # Return an error message indicating the issue
                             return f"Error: MCP tool '{tool_name}' returned a coroutine object instead of executing it. This suggests the tool is async but not properly handled by the MCP server."
                         return text
                     # If it's a JSON response, return the JSON content
                     elif hasattr(item, 'json') and item.json is not None:
-                        import json
-                        return json.dumps(item.json, ensure_ascii=False, indent=2)
+                        try:
+                            return orjson.dumps(item.json).decode("utf-8")
+                        except TypeError:
+                            # orjson rejects some values (e.g. ints beyond 64 bits)
+                            return json.dumps(item.json, ensure_ascii=False)
 
                 # Fallback to string representation
                 if res:
                     result_str = str(res[0])
                     # Check for coroutine object in fallback as well
-                    if "<coroutine object" in result_str and "at 0x" in result_str:
+                    if _looks_like_coroutine_repr(result_str):
                         return f"Error: MCP tool '{tool_name}' returned a coroutine object instead of executing it. This suggests the tool is async but not properly handled by the MCP server."
                     return result_str
 
@@ -238,7 +356,7 @@ class MCPClientMixin:
             return f"MCP tool '{tool_name}' execution failed: {str(e)}"
 
     async def send_mcp_message(self, recipient: str, message: Union[str, Dict[str, Any]],
-                              topic: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> bool:
+                              topic: str = "general", metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Send a message to the MCP system
 
@@ -252,11 +370,8 @@ class MCPClientMixin:
             bool: Whether the message was sent successfully
         """
         if isinstance(message, str):
-            content = {
-                "text": message,
-                "source": "agent",
-            }
-            if metadata:
+            content = {"text": message, "source": "agent"}
+            if metadata is not None:
                 content["metadata"] = metadata
         else:
             content = message
@@ -266,7 +381,7 @@ class MCPClientMixin:
                 await session.send_message(
                     recipient=recipient,
                     message=content,
-                    topic=topic or "general"
+                    topic=topic
                 )
             return True
         except Exception as e:
@@ -276,13 +391,18 @@ class MCPClientMixin:
     async def cleanup(self):
         """Enhanced cleanup method with comprehensive resource cleanup."""
         logger.info("Starting comprehensive MCP client cleanup")
+        self._bind_to_running_loop()
+
+        if self._reaper_handle is not None:
+            self._reaper_handle.cancel()
+            self._reaper_handle = None
         
-        # Close all active sessions
-        cleanup_tasks = []
-        for task_id, session_info in list(self._task_sessions.items()):
-            cleanup_tasks.append(
-                self._cleanup_session(task_id, session_info, session_info.get("session"))
-            )
+        # Close all active sessions; the coroutines only touch _task_sessions
+        # once gathered, after the comprehension has finished iterating it
+        cleanup_tasks = [
+            self._cleanup_session(task, session_info, session_info.get("session"))
+            for task, session_info in self._task_sessions.items()
+        ]
         
         if cleanup_tasks:
             logger.info(f"Cleaning up {len(cleanup_tasks)} active MCP sessions")
@@ -290,16 +410,21 @@ class MCPClientMixin:
         
         # Reset all tracking
         self._task_sessions.clear()
-        self._session_count = 0
-        self._session_stats["active"] = 0
+        self._pending_cleanup.clear()
+        self._session_slots = asyncio.Semaphore(self._max_concurrent_sessions)
+        self._session_stats.active = 0
+
+        # Tear down the shared connection exactly once
+        async with self._connect_lock:
+            await self._close_shared_session()
         
         logger.info("MCP client cleanup completed")
-        logger.info(f"Session stats: {self._session_stats}")
+        logger.info(f"Session stats: {self._session_stats.as_dict()}")
 
     def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics for monitoring."""
         return {
-            **self._session_stats,
+            **self._session_stats.as_dict(),
             "current_sessions": len(self._task_sessions),
             "max_sessions": self._max_concurrent_sessions
         }
\ No newline at end of file
@@ -16,6 +16,8 @@ from .toolcall import ToolCallAgent
 
 logger = logging.getLogger(__name__)
 
+_X402_TOOL_NAMES = ("x402_create_payment", "x402_paywalled_request")
+
 def create_configured_chatbot():
     """Create a ChatBot instance with intelligent provider selection."""
     from spoon_ai.llm.config import ConfigurationManager
@@ -77,7 +79,13 @@ class SpoonReactAI(ToolCallAgent):
 
     async def _ensure_x402_tools(self) -> None:
         """Attach x402 helper tools if configuration is available."""
-        if not self.x402_enabled or getattr(self, "_x402_tools_initialized", False):
+        if not self.x402_enabled or self._x402_tools_initialized:
+            return
+
+        tool_map = self.available_tools.tool_map
+        if all(name in tool_map for name in _X402_TOOL_NAMES):
+            # Both helpers were registered up front; skip the imports and service setup
+            self._x402_tools_initialized = True
             return
 
         try:
@@ -99,13 +107,9 @@ class SpoonReactAI(ToolCallAgent):
             self._x402_tools_initialized = True
             return
 
-        if getattr(self, "avaliable_tools", None) is None:
-            self.avaliable_tools = ToolManager([])
-
-        existing = set(self.avaliable_tools.tool_map.keys())
-        if "x402_create_payment" not in existing:
-            self.avaliable_tools.add_tool(X402PaymentHeaderTool(service=service))
-        if "x402_paywalled_request" not in existing:
-            self.avaliable_tools.add_tool(X402PaywalledRequestTool(service=service))
+        if "x402_create_payment" not in tool_map:
+            self.available_tools.add_tool(X402PaymentHeaderTool(service=service))
+        if "x402_paywalled_request" not in tool_map:
+            self.available_tools.add_tool(X402PaywalledRequestTool(service=service))
 
         self._x402_tools_initialized = True
@@ -1,4 +1,5 @@
 import asyncio
+from types import MappingProxyType
 from spoon_ai.agents.spoon_react import SpoonReactAI
 from spoon_ai.tools.tool_manager import ToolManager
 from pydantic import Field
@@ -6,10 +7,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Schema template for tools that expose no parameters. Tool validation copies it
+# into a new dict for every descriptor; read-only so the template itself never changes
+_EMPTY_SCHEMA = MappingProxyType({"type": "object", "properties": {}, "required": []})
+_DEFAULT_PRELOAD_TIMEOUT = 40.0
+
 class SpoonReactMCP(SpoonReactAI):
     name: str = "spoon_react_mcp"
     description: str = "A smart ai agent in neo blockchain with mcp"
     available_tools: ToolManager = Field(default_factory=lambda: ToolManager([]))
+    mcp_preload_concurrency: int = Field(default=8, description="Maximum number of MCP tools loading parameters at once")
 
     def __init__(self, tools=None, **kwargs):
         # Handle tools parameter
@@ -26,47 +33,48 @@ class SpoonReactMCP(SpoonReactAI):
         # Import here to avoid circular imports
         from mcp.types import Tool as MCPTool
 
-        # Return MCP tools that are available in the tool manager
-        # Create proper MCPTool objects that match the expected interface
-        mcp_tools = []
+        mcp_tool_instances = self.available_tools.mcp_tools
 
-        # Pre-load parameters for all MCP tools concurrently
-        async def load_tool_params(tool):
-            if hasattr(tool, 'ensure_parameters_loaded'):
-                try:
-                    # Derive a sensible timeout from the tool's own connection timeout
-                    base_timeout = float(getattr(tool, '_connection_timeout', 30))
-                    preload_timeout = max(15.0, min(base_timeout + 10.0, 60.0))
-                    await asyncio.wait_for(tool.ensure_parameters_loaded(), timeout=preload_timeout)
-                except asyncio.TimeoutError:
-                    logger.warning(f"Timeout loading parameters for tool: {tool.name}")
-                except Exception as e:
-                    logger.warning(f"Failed loading parameters for tool {tool.name}: {e}")
-            return tool
+        # Steady state: once every tool has its server schema there is nothing
+        # to preload, so skip the gather (and the reindex) entirely
+        to_load = [
+            tool for tool in mcp_tool_instances
+            if hasattr(tool, 'ensure_parameters_loaded') and not getattr(tool, '_parameters_loaded', False)
+        ]
+        if to_load:
+            # Pre-load parameters concurrently, bounded so a large tool set does
+            # not flood the upstream server or the session limit
+            preload_slots = asyncio.Semaphore(max(1, self.mcp_preload_concurrency))
 
-        mcp_tool_instances = [tool for tool in self.available_tools.tool_map.values() if hasattr(tool, 'mcp_config')]
-        loaded_tools = await asyncio.gather(*[load_tool_params(tool) for tool in mcp_tool_instances])
+            async def load_tool_params(tool):
+                async with preload_slots:
+                    try:
+                        # MCPTool derives this from its connection timeout at construction
+                        preload_timeout = getattr(tool, '_preload_timeout', _DEFAULT_PRELOAD_TIMEOUT)
+                        await asyncio.wait_for(tool.ensure_parameters_loaded(), timeout=preload_timeout)
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Timeout loading parameters for tool: {tool.name}")
+                    except Exception as e:
+                        logger.warning(f"Failed loading parameters for tool {tool.name}: {e}")
 
-        # Some MCP tools may have updated their name after fetching server schema
-        # Ensure the ToolManager reflects any dynamic renames
-        try:
-            if hasattr(self, 'available_tools') and hasattr(self.available_tools, 'reindex'):
+            await asyncio.gather(*[load_tool_params(tool) for tool in to_load])
+
+            # Some MCP tools may have updated their name after fetching server schema
+            # Ensure the ToolManager reflects any dynamic renames
+            try:
                 self.available_tools.reindex()
-        except Exception:
-            pass
+            except Exception:
+                pass
 
-        for tool in loaded_tools:
-            # Create proper MCPTool instance for the tool system
-            mcp_tool = MCPTool(
+        # Create proper MCPTool objects that match the expected interface
+        mcp_tools = [
+            MCPTool(
                 name=tool.name,
                 description=tool.description,
-                inputSchema=tool.parameters if tool.parameters else {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
+                inputSchema=tool.parameters or _EMPTY_SCHEMA,
             )
-            mcp_tools.append(mcp_tool)
+            for tool in mcp_tool_instances
+        ]
 
         if mcp_tools:
             logger.info(f"Found {len(mcp_tools)} MCP tools: {[t.name for t in mcp_tools]}")
@@ -65,7 +65,7 @@ class SpoonReactMCP(SpoonReactAI):
                     logger.warning(f"Failed loading parameters for tool {tool.name}: {e}")
             return tool
 
-        mcp_tool_instances = [tool for tool in self.available_tools.tool_map.values() if hasattr(tool, 'mcp_config')]
+        mcp_tool_instances = self.available_tools.mcp_tools
         loaded_tools = await asyncio.gather(*[load_tool_params(tool) for tool in mcp_tool_instances])
 
         # Some MCP tools may have updated their name after fetching server schema
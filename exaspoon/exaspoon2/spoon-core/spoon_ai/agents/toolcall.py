@@ -1,11 +1,16 @@
 import json
 import asyncio
+import re
 import time
+import weakref
+from collections import OrderedDict
+from itertools import chain
 from logging import getLogger
-from typing import Any, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 import logging
 
-from pydantic import AliasChoices, Field
+import orjson
+from pydantic import AliasChoices, Field, PrivateAttr, field_validator
 from termcolor import colored
 
 from spoon_ai.agents.react import ReActAgent
@@ -14,12 +19,62 @@ from spoon_ai.prompts.toolcall import \
 from spoon_ai.prompts.toolcall import SYSTEM_PROMPT as TOOLCALL_SYSTEM_PROMPT
 from spoon_ai.schema import TOOL_CHOICE_TYPE, AgentState, ToolCall, ToolChoice, Message, Role
 from spoon_ai.tools import ToolManager
+from spoon_ai.tools.base import ToolFailure
 from mcp.types import Tool as MCPTool
 
 logging.getLogger("spoon_ai").setLevel(logging.INFO)
 
 logger = getLogger("spoon_ai")
 
+# Error phrases produced by ToolManager/MCP failures; they appear at the start of
+# the observation, so only a bounded prefix of each result is scanned
+_TOOL_ERROR_RE = re.compile(r"not healthy|execution failed", re.IGNORECASE)
+_TOOL_ERROR_SCAN_LIMIT = 512
+# Native finish reasons that confirm a "stop": OpenAI "stop", Anthropic "end_turn"
+_TERMINATION_NATIVE_REASONS = frozenset({"stop", "end_turn"})
+
+
+def _parse_tool_arguments(arguments: Any) -> dict:
+    """Parse tool-call arguments into a kwargs dict."""
+    if isinstance(arguments, str):
+        arguments = arguments.strip()
+        # Only a JSON object can become kwargs; skip the parser for anything else
+        if not arguments.startswith("{"):
+            if arguments:
+                print(f"JSON decode failed for arguments string: {arguments}")
+            return {}
+        try:
+            return orjson.loads(arguments)
+        except orjson.JSONDecodeError:
+            try:
+                # orjson is strict about a few inputs json accepts (e.g. NaN)
+                return json.loads(arguments)
+            except json.JSONDecodeError:
+                print(f"JSON decode failed for arguments string: {arguments}")
+                return {}
+    elif isinstance(arguments, dict):
+        return arguments
+    else:
+        return {}
+
+def _convert_mcp_tool(tool: MCPTool) -> dict:
+    # Convert MCPTool to function call parameter format, using the actual
+    # server tool name if ensure_parameters_loaded renamed it.
+    params = getattr(tool, 'parameters', None) or getattr(tool, 'inputSchema', None) or {
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+    return {
+        "type": "function",
+        "function": {
+            "name": getattr(tool, 'name', 'mcp_tool'),
+            "description": getattr(tool, 'description', 'MCP tool'),
+            "parameters": params
+        }
+    }
+
+
 class ToolCallAgent(ReActAgent):
 
     name: str = "toolcall"
@@ -39,57 +94,101 @@ class ToolCallAgent(ReActAgent):
     tool_calls: List[ToolCall] = Field(default_factory=list)
 
     output_queue: asyncio.Queue = Field(default_factory=asyncio.Queue)
+    # Emit the legacy separate {"content"} and {"tool_calls"} events per step
+    split_output_events: bool = Field(default=False, description="Emit content and tool_calls as two stream events")
+
+    # Upper bound on tool calls from one LLM response that run concurrently
+    max_parallel_tools: int = Field(default=8, description="Maximum number of tool calls executed at once")
+
+    # Opt-in memoization of local tool results keyed on (name, canonical args)
+    tool_cache_enabled: bool = Field(default=False, description="Reuse results of identical local tool calls")
+    tool_cache_ttl: float = Field(default=60.0, description="Seconds a cached tool result stays fresh")
+    tool_cache_max: int = Field(default=256, description="Maximum number of cached tool results")
+    tool_cache_exempt: Set[str] = Field(default_factory=set, description="Non-idempotent tools that are never cached")
 
     # Track last tool error for higher-level fallbacks
     last_tool_error: Optional[str] = Field(default=None, exclude=True)
 
     # MCP Tools Caching
-    mcp_tools_cache: Optional[List[MCPTool]] = Field(default=None, exclude=True)
+    mcp_tools_cache: Optional[Tuple[MCPTool, ...]] = Field(default=None, exclude=True)
     mcp_tools_cache_timestamp: Optional[float] = Field(default=None, exclude=True)
     mcp_tools_cache_ttl: float = Field(default=300.0, exclude=True)  # 5 minutes TTL
+    mcp_tools_cache_max: int = Field(default=512, exclude=True)  # Larger catalogs are not cached
+    # Bumped whenever the MCP tool list served to think() may have changed
+    _mcp_cache_version: int = PrivateAttr(default=0)
+    # ((tool manager id, tool manager version, MCP cache version), merged tool params)
+    _tools_params_cache: Optional[Tuple[Tuple[int, int, int], List[dict]]] = PrivateAttr(default=None)
+    # Lowercased special_tool_names and the list object it was built from
+    _special_tool_names_lower: FrozenSet[str] = PrivateAttr(default=frozenset())
+    _special_tool_names_source: Optional[List[str]] = PrivateAttr(default=None)
+    # (tool name, canonical JSON args) -> (monotonic timestamp, result), oldest first
+    _tool_result_cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = PrivateAttr(default_factory=OrderedDict)
+    # One cache lock per event loop, so an agent reused across loops never
+    # awaits a lock bound to a different (possibly closed) loop
+    _cache_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = PrivateAttr(
+        default_factory=weakref.WeakKeyDictionary
+    )
 
-    async def _get_cached_mcp_tools(self) -> List[MCPTool]:
-        """Get MCP tools with caching to avoid repeated server calls."""
-        current_time = time.time()
+    @field_validator("special_tool_names", mode="after")
+    @classmethod
+    def _normalize_special_tool_names(cls, names: List[str]) -> List[str]:
+        # Canonicalise once at construction: stripped and de-duplicated, in order
+        return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
 
-        # Thread-safe cache check
-        async with asyncio.Lock() if not hasattr(self, '_cache_lock') else asyncio.Lock():
-            if not hasattr(self, '_cache_lock'):
-                self._cache_lock = asyncio.Lock()
+    def _get_cache_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._cache_locks.get(loop)
+        if lock is None:
+            lock = self._cache_locks.setdefault(loop, asyncio.Lock())
+        return lock
+
+    async def _get_cached_mcp_tools(self) -> Sequence[MCPTool]:
+        """Get MCP tools with caching to avoid repeated server calls.
+
+        Cache hits return the cached tuple itself; it is immutable, so no copy is needed.
+        """
+        current_time = time.time()
 
-        async with self._cache_lock:
+        async with self._get_cache_lock():
             # Check if cache is valid and not expired
             if (self.mcp_tools_cache is not None and
                 self.mcp_tools_cache_timestamp is not None and
                 current_time - self.mcp_tools_cache_timestamp < self.mcp_tools_cache_ttl):
                 logger.info(f"♻️ {self.name} using cached MCP tools ({len(self.mcp_tools_cache)} tools)")
-                return self.mcp_tools_cache.copy() # Return copy to prevent external modification
+                return self.mcp_tools_cache
 
             # Cache expired or invalid - clean up and fetch fresh
             self._invalidate_mcp_cache()
 
 
             if hasattr(self, "list_mcp_tools"):
+                # Whatever comes back below is a new list for think()
+                self._mcp_cache_version += 1
                 try:
                     logger.info(f"🔄 {self.name} fetching MCP tools from server...")
                     mcp_tools = await self.list_mcp_tools()
 
-                    # Validate and limit cache size (prevent memory bloat)
-                    if isinstance(mcp_tools, list) and len(mcp_tools) <= 100:
-                        self.mcp_tools_cache = mcp_tools
-                        self.mcp_tools_cache_timestamp = current_time
-                        logger.info(f"📋 {self.name} cached {len(mcp_tools)} MCP tools")
-                        return mcp_tools.copy()
-                    else:
-                        logger.warning(f"⚠️ {self.name} received {len(mcp_tools) if isinstance(mcp_tools, list) else 'invalid'} tools - not caching")
-                        return mcp_tools if isinstance(mcp_tools, list) else []
+                    if not isinstance(mcp_tools, list):
+                        logger.warning(f"⚠️ {self.name} received invalid MCP tools - not caching")
+                        return ()
+
+                    # Every fetched tool is returned; a catalog over the limit
+                    # is just not cached (prevent memory bloat)
+                    tools = tuple(mcp_tools)
+                    if len(tools) > self.mcp_tools_cache_max:
+                        logger.warning(f"⚠️ {self.name} received {len(tools)} MCP tools, over the cache limit ({self.mcp_tools_cache_max}) - not caching")
+                        return tools
+                    self.mcp_tools_cache = tools
+                    self.mcp_tools_cache_timestamp = current_time
+                    logger.info(f"📋 {self.name} cached {len(tools)} MCP tools")
+                    return tools
 
                 except Exception as e:
                     logger.error(f"❌ {self.name} failed to fetch MCP tools: {e}")
-                    # Return empty list on error rather than crashing
-                    return []
+                    # Return no tools on error rather than crashing
+                    return ()
 
-        return []
+        return ()
 
 
 
@@ -110,33 +209,27 @@ class ToolCallAgent(ReActAgent):
         if self.next_step_prompt:
             await self.add_message("user", self.next_step_prompt)
 
-        # Use cached MCP tools to avoid repeated server calls
-        mcp_tools = await self._get_cached_mcp_tools()
-
-        def convert_mcp_tool(tool: MCPTool) -> dict:
-            # Convert MCPTool to function call parameter format, using the actual
-            # server tool name if ensure_parameters_loaded renamed it.
-            params = getattr(tool, 'parameters', None) or getattr(tool, 'inputSchema', None) or {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-            return {
-                "type": "function",
-                "function": {
-                    "name": getattr(tool, 'name', 'mcp_tool'),
-                    "description": getattr(tool, 'description', 'MCP tool'),
-                    "parameters": params
-                }
-            }
-
-        all_tools = self.available_tools.to_params()
-        mcp_tools_params = [convert_mcp_tool(tool) for tool in mcp_tools]
-        unique_tools = {}
-        for tool in all_tools + mcp_tools_params:
-            tool_name = tool["function"]["name"]
-            unique_tools[tool_name] = tool
-        unique_tools_list = list(unique_tools.values())
+        if self.tool_choices == ToolChoice.NONE:
+            # The model will not call tools, so skip the MCP fetch and merge. Some
+            # providers reject an empty tools array, so still send a valid list.
+            if self._tools_params_cache is not None:
+                unique_tools_list = self._tools_params_cache[1]
+            else:
+                unique_tools_list = self.available_tools.cached_params
+        else:
+            # Use cached MCP tools to avoid repeated server calls
+            mcp_tools = await self._get_cached_mcp_tools()
+
+            # Reuse the merged tool list while neither source has changed. Local MCP
+            # tools rewrite their own schema on first load, so only cache once
+            # every one of them has loaded.
+            tools_key = (id(self.available_tools), self.available_tools.version, self._mcp_cache_version)
+            if self._tools_params_cache is not None and self._tools_params_cache[0] == tools_key:
+                unique_tools_list = self._tools_params_cache[1]
+            else:
+                unique_tools_list = self._build_tools_params(mcp_tools)
+                if all(getattr(tool, '_parameters_loaded', True) for tool in self.available_tools.mcp_tools):
+                    self._tools_params_cache = (tools_key, unique_tools_list)
 
         # Bound LLM tool selection time to avoid step-level timeouts
         llm_timeout = max(20.0, min(60.0, getattr(self, '_default_timeout', 30.0) - 5.0))
@@ -171,17 +264,27 @@ class ToolCallAgent(ReActAgent):
             self._final_response_content = response.content or "Task completed"
             return False
 
-        # Reduce log verbosity: only log length and presence
-        logger.info(colored(f"🤔 {self.name}'s thoughts received (len={len(response.content) if response.content else 0})", "cyan"))
-        tool_count = len(self.tool_calls) if self.tool_calls else 0
-        if tool_count:
-            logger.info(colored(f"🛠️ {self.name} selected {tool_count} tools", "green"))
-        else:
-            logger.info(colored(f"🛠️ {self.name} selected no tools", "yellow"))
+        # Reduce log verbosity: only log length and presence. Skip building the
+        # colored strings entirely when INFO records would be dropped.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(colored(f"🤔 {self.name}'s thoughts received (len={len(response.content) if response.content else 0})", "cyan"))
+            tool_count = len(self.tool_calls) if self.tool_calls else 0
+            if tool_count:
+                logger.info(colored(f"🛠️ {self.name} selected {tool_count} tools", "green"))
+            else:
+                logger.info(colored(f"🛠️ {self.name} selected no tools", "yellow"))
 
         if self.output_queue:
-            self.output_queue.put_nowait({"content": response.content})
-            self.output_queue.put_nowait({"tool_calls": response.tool_calls})
+            if self.split_output_events:
+                self.output_queue.put_nowait({"content": response.content})
+                self.output_queue.put_nowait({"tool_calls": response.tool_calls})
+            else:
+                # One event per step so stream consumers wake up once
+                self.output_queue.put_nowait({
+                    "content": response.content,
+                    "tool_calls": response.tool_calls,
+                    "step": self.current_step,
+                })
 
         try:
             if self.tool_choices == ToolChoice.NONE:
@@ -199,12 +302,22 @@ class ToolCallAgent(ReActAgent):
                 return bool(response.content)
             return bool(self.tool_calls)
         except Exception as e:
-            logger.error(f"{self.name} failed to think: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            # exc_info defers traceback formatting to handlers that emit the record
+            logger.error(f"{self.name} failed to think: {e}", exc_info=True)
             await self.add_message("assistant", f"Error encountered while thinking: {e}")
             return False
 
+    def _build_tools_params(self, mcp_tools: Sequence[MCPTool]) -> List[dict]:
+        """Merge local tool params with converted MCP tools, deduplicated by name."""
+        all_tools = self.available_tools.cached_params
+        # Single pass over both sources: an MCP tool overrides a local tool of
+        # the same name while keeping the local tool's position
+        unique_tools = {
+            tool["function"]["name"]: tool
+            for tool in chain(all_tools, map(_convert_mcp_tool, mcp_tools))
+        }
+        return list(unique_tools.values())
+
     async def run(self, request: Optional[str] = None) -> str:
         """Override run method to handle finish_reason termination specially."""
         if self.state != AgentState.IDLE:
@@ -234,14 +347,9 @@ class ToolCallAgent(ReActAgent):
                     try:
                         # Allow more time when MCP tools are available or selected
                         step_timeout = self._default_timeout
-                        has_mcp_tools = False
-                        try:
-                            if hasattr(self, 'available_tools') and hasattr(self.available_tools, 'tool_map'):
-                                has_mcp_tools = any(hasattr(t, 'mcp_config') for t in self.available_tools.tool_map.values())
-                            if not has_mcp_tools:
-                                has_mcp_tools = bool(getattr(self, 'mcp_tools_cache', None))
-                        except Exception:
-                            pass
+                        # ToolManager caches its MCP subset until the next mutation,
+                        # so this stays O(1) per step
+                        has_mcp_tools = bool(self.available_tools.mcp_tools) or bool(self.mcp_tools_cache)
                         if has_mcp_tools:
                             step_timeout = max(step_timeout, 60.0)
                         if getattr(self, 'tool_calls', None):
@@ -303,21 +411,39 @@ class ToolCallAgent(ReActAgent):
                 raise ValueError("No tools to call")
             return self.memory.messages[-1].content or "No response from assistant"
 
-        results = []
-        for tool_call in self.tool_calls:
+        async def run_one(tool_call: ToolCall) -> Any:
             try:
-                result = await self.execute_tool(tool_call)
-                logger.info(f"Tool {tool_call.function.name} executed with result: {result}")
-                # Flag error-like results so callers can decide on fallbacks
-                if isinstance(result, str) and (
-                    "not healthy" in result.lower() or "execution failed" in result.lower()
-                ):
-                    self.last_tool_error = result
+                return await self.execute_tool(tool_call)
             except Exception as e:
+                return e
+
+        # Independent tool calls run concurrently (bounded); results are still
+        # recorded in the order the LLM requested them
+        tool_calls = list(self.tool_calls)
+        if len(tool_calls) == 1:
+            outcomes = [await run_one(tool_calls[0])]
+        else:
+            slots = asyncio.Semaphore(max(1, self.max_parallel_tools))
+
+            async def run_bounded(tool_call: ToolCall) -> Any:
+                async with slots:
+                    return await run_one(tool_call)
+
+            outcomes = await asyncio.gather(*[run_bounded(tool_call) for tool_call in tool_calls])
+
+        results = []
+        for tool_call, result in zip(tool_calls, outcomes):
+            if isinstance(result, Exception):
                 # Ensure we always create a tool response, even on failure
+                e = result
                 result = f"Error executing tool {tool_call.function.name}: {str(e)}"
                 logger.error(f"Tool {tool_call.function.name} execution failed: {e}")
                 self.last_tool_error = str(e)
+            else:
+                logger.info(f"Tool {tool_call.function.name} executed with result: {result}")
+                # Flag error-like results so callers can decide on fallbacks
+                if isinstance(result, str) and _TOOL_ERROR_RE.search(result, 0, _TOOL_ERROR_SCAN_LIMIT):
+                    self.last_tool_error = result
 
             # Always add a tool message for each tool call to satisfy OpenAI API requirements
             await self.add_message("tool", result, tool_call_id=tool_call.id, tool_name=tool_call.function.name)
@@ -325,30 +451,17 @@ class ToolCallAgent(ReActAgent):
         return "\n\n".join(results)
 
     async def execute_tool(self, tool_call: ToolCall) -> str:
-        def parse_tool_arguments(arguments):
-            """Parse tool arguments using improved logic."""
-            if isinstance(arguments, str):
-                arguments = arguments.strip()
-                if not arguments:
-                    return {}
-                try:
-                    return json.loads(arguments)
-                except json.JSONDecodeError:
-                    print(f"JSON decode failed for arguments string: {arguments}")
-                    return {}
-            elif isinstance(arguments, dict):
-                return arguments
-            else:
-                return {}
-
         if tool_call.function.name not in self.available_tools.tool_map:
-            kwargs = parse_tool_arguments(tool_call.function.arguments)
+            kwargs = _parse_tool_arguments(tool_call.function.arguments)
 
             # Prefer executing via an existing MCPTool instance if available
             try:
-                mcp_tools = [t for t in self.available_tools.tool_map.values() if hasattr(t, 'mcp_config')]
-                # Direct name match to a specific MCPTool instance (post-rename)
-                direct_match = next((t for t in mcp_tools if getattr(t, 'name', None) == tool_call.function.name), None)
+                # ToolManager keeps the MCP subset cached between mutations, so no
+                # reflective scan over every local tool happens per call
+                mcp_tools = self.available_tools.mcp_tools
+                # Direct name match to a specific MCPTool instance (post-rename);
+                # compares live names since a rename does not reindex the manager
+                direct_match = next((t for t in mcp_tools if t.name == tool_call.function.name), None)
                 if direct_match is not None:
                     return await direct_match.execute(**kwargs)
 
@@ -384,8 +497,12 @@ class ToolCallAgent(ReActAgent):
             return f"Error: Tool {name} not found"
 
         try:
-            args = parse_tool_arguments(tool_call.function.arguments)
-            result = await self.available_tools.execute(name=name, tool_input=args)
+            args = _parse_tool_arguments(tool_call.function.arguments)
+            cache_key = self._tool_cache_key(name, args)
+            result = self._cached_tool_result(cache_key)
+            if result is None:
+                result = await self.available_tools.execute(name=name, tool_input=args)
+                self._store_tool_result(cache_key, result)
 
             observation = (
                 f"Observed output of cmd {name} execution: {result}"
@@ -401,6 +518,37 @@ class ToolCallAgent(ReActAgent):
             self.last_tool_error = str(e)
             raise
 
+    def _tool_cache_key(self, name: str, args: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        if not self.tool_cache_enabled or name in self.tool_cache_exempt:
+            return None
+        try:
+            return (name, orjson.dumps(args, option=orjson.OPT_SORT_KEYS).decode("utf-8"))
+        except TypeError:
+            # Arguments that cannot be canonicalised are simply not cached
+            return None
+
+    def _cached_tool_result(self, key: Optional[Tuple[str, str]]) -> Any:
+        if key is None:
+            return None
+        entry = self._tool_result_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.tool_cache_ttl:
+            del self._tool_result_cache[key]
+            return None
+        self._tool_result_cache.move_to_end(key)
+        return entry[1]
+
+    def _store_tool_result(self, key: Optional[Tuple[str, str]], result: Any) -> None:
+        # Failures are never cached so the next identical call retries
+        if key is None or not result or isinstance(result, ToolFailure) or getattr(result, "error", None):
+            return
+        cache = self._tool_result_cache
+        cache[key] = (time.monotonic(), result)
+        cache.move_to_end(key)
+        while len(cache) > self.tool_cache_max:
+            cache.popitem(last=False)
+
     def consume_last_tool_error(self) -> Optional[str]:
         err = getattr(self, "last_tool_error", None)
         self.last_tool_error = None
@@ -414,8 +562,20 @@ class ToolCallAgent(ReActAgent):
             self.state = AgentState.FINISHED
         return
 
+    def set_special_tools(self, names: List[str]) -> None:
+        """Replace special_tool_names; use this rather than mutating the list in place."""
+        self.special_tool_names = self._normalize_special_tool_names(names)
+        self._refresh_special_tools()
+
+    def _refresh_special_tools(self) -> None:
+        self._special_tool_names_lower = frozenset(n.lower() for n in self.special_tool_names)
+        self._special_tool_names_source = self.special_tool_names
+
     def _is_special_tool(self, name: str) -> bool:
-        return name.lower() in [n.lower() for n in self.special_tool_names]
+        # Rebuild the lookup lazily, including after the field is reassigned
+        if self._special_tool_names_source is not self.special_tool_names:
+            self._refresh_special_tools()
+        return name.lower() in self._special_tool_names_lower
 
     def _should_finish_execution(self, name: str, result: Any, **kwargs) -> bool:
         return True
@@ -424,16 +584,15 @@ class ToolCallAgent(ReActAgent):
         """Check if agent should terminate based on finish_reason signals."""
         # For Anthropic: native_finish_reason="end_turn" maps to finish_reason="stop"
         # For OpenAI: both finish_reason and native_finish_reason are "stop"
-        finish_reason = getattr(response, 'finish_reason', None)
-        native_finish_reason = getattr(response, 'native_finish_reason', None)
-
-        if finish_reason == "stop":
-            # Accept either "stop" (OpenAI) or "end_turn" (Anthropic) as valid termination signals
-            return native_finish_reason in ["stop", "end_turn"]
-        return False
+        return (
+            getattr(response, 'finish_reason', None) == "stop"
+            and getattr(response, 'native_finish_reason', None) in _TERMINATION_NATIVE_REASONS
+        )
 
     def _invalidate_mcp_cache(self):
         """Properly invalidate and clean up MCP tools cache."""
+        if self.mcp_tools_cache is not None:
+            self._mcp_cache_version += 1
         self.mcp_tools_cache = None
         self.mcp_tools_cache_timestamp = None
         logger.debug(f"🧹 {self.name} invalidated MCP tools cache")
@@ -446,9 +605,6 @@ class ToolCallAgent(ReActAgent):
 
         #cache cleanup
         self._invalidate_mcp_cache()
-
-        # Clean up lock if it exists
-        if hasattr(self, '_cache_lock'):
-            delattr(self, '_cache_lock')
+        self._tool_result_cache.clear()
 
         logger.debug(f"🧹 {self.name} fully cleared state and cache")
@@ -18,6 +18,7 @@ from spoon_ai.callbacks.base import (
 from spoon_ai.callbacks.manager import (
     CallbackManager,
     AsyncCallbackManager,
+    NOOP,
 )
 from spoon_ai.callbacks.streaming_stdout import (
     StreamingStdOutCallbackHandler,
@@ -40,6 +41,7 @@ __all__ = [
     # Managers
     "CallbackManager",
     "AsyncCallbackManager",
+    "NOOP",
     
     # Built-in handlers
     "StreamingStdOutCallbackHandler",
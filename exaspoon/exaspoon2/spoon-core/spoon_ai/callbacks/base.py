@@ -1,7 +1,15 @@
+"""Callback handler base classes and hook mixins.
+
+The mixins and base handlers declare ``__slots__ = ()`` so that stateless
+handlers carry no per-instance ``__dict__``. Subclasses that keep state get a
+``__dict__`` automatically unless they declare their own ``__slots__``.
+"""
+
 from __future__ import annotations
 
+import inspect
 from abc import ABC
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 from uuid import UUID
 
 from spoon_ai.schema import LLMResponse, LLMResponseChunk, Message
@@ -10,6 +18,8 @@ from spoon_ai.schema import LLMResponse, LLMResponseChunk, Message
 class RetrieverManagerMixin:
     """Mixin providing retriever callback hooks."""
 
+    __slots__ = ()
+
     def on_retriever_start(
         self,
         run_id: UUID,
@@ -39,6 +49,8 @@ class RetrieverManagerMixin:
 class LLMManagerMixin:
     """Mixin providing large language model callback hooks."""
 
+    __slots__ = ()
+
     def on_llm_start(
         self,
         run_id: UUID,
@@ -57,6 +69,21 @@ class LLMManagerMixin:
     ) -> Any:
         """Run for each streamed token emitted by an LLM."""
 
+    def on_llm_new_token_batch(
+        self,
+        tokens: str,
+        *,
+        chunks: List[Optional[LLMResponseChunk]],
+        run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run for a batch of streamed tokens when the manager batches tokens.
+
+        ``tokens`` is the batch joined into one string and ``chunks`` holds
+        each token's chunk in order. Handlers that implement this receive it
+        instead of ``on_llm_new_token``.
+        """
+
     def on_llm_end(
         self,
         response: LLMResponse,
@@ -79,6 +106,8 @@ class LLMManagerMixin:
 class ChainManagerMixin:
     """Mixin providing chain-level callback hooks."""
 
+    __slots__ = ()
+
     def on_chain_start(
         self,
         run_id: UUID,
@@ -108,6 +137,8 @@ class ChainManagerMixin:
 class ToolManagerMixin:
     """Mixin providing tool callback hooks."""
 
+    __slots__ = ()
+
     def on_tool_start(
         self,
         tool_name: str,
@@ -142,6 +173,8 @@ class ToolManagerMixin:
 class PromptManagerMixin:
     """Mixin providing prompt template callback hooks."""
 
+    __slots__ = ()
+
     def on_prompt_start(
         self,
         run_id: UUID,
@@ -178,6 +211,8 @@ class BaseCallbackHandler(
 ):
     """Base class for SpoonAI callback handlers."""
 
+    __slots__ = ()
+
     raise_error: bool = False
     """Whether to re-raise exceptions originating from callbacks."""
 
@@ -211,123 +246,39 @@ class BaseCallbackHandler(
 
 
 class AsyncCallbackHandler(BaseCallbackHandler):
-    """Async version of the callback handler base class."""
+    """Async version of the callback handler base class.
 
-    async def on_llm_start(
-        self,
-        run_id: UUID,
-        messages: List[Message],
-        **kwargs: Any,
-    ) -> None:
-        return None
+    Every hook is an ``async`` no-op generated by :func:`_async_noop_hook`;
+    signatures and docstrings are taken from the corresponding mixin method.
+    """
 
-    async def on_llm_new_token(
-        self,
-        token: str,
-        *,
-        chunk: Optional[LLMResponseChunk] = None,
-        run_id: Optional[UUID] = None,
-        **kwargs: Any,
-    ) -> None:
-        return None
+    __slots__ = ()
 
-    async def on_llm_end(
-        self,
-        response: LLMResponse,
-        *,
-        run_id: UUID,
-        **kwargs: Any,
-    ) -> None:
-        return None
 
-    async def on_llm_error(
-        self,
-        error: BaseException,
-        *,
-        run_id: UUID,
-        **kwargs: Any,
-    ) -> None:
-        return None
+def _async_noop_hook(template: Callable[..., Any]) -> Callable[..., Any]:
+    """Build an ``async`` no-op hook mirroring ``template``'s name, signature and docs."""
 
-    async def on_tool_start(
-        self,
-        tool_name: str,
-        tool_input: Any,
-        *,
-        run_id: UUID,
-        **kwargs: Any,
-    ) -> None:
+    async def hook(self, *args: Any, **kwargs: Any) -> None:
         return None
 
-    async def on_tool_end(
-        self,
-        tool_name: str,
-        tool_output: Any,
-        *,
-        run_id: UUID,
-        **kwargs: Any,
-    ) -> None:
-        return None
-
-    async def on_tool_error(
-        self,
-        error: BaseException,
-        *,
-        run_id: UUID,
-        tool_name: Optional[str] = None,
-        **kwargs: Any,
-    ) -> None:
-        return None
-
-    async def on_retriever_start(
-        self,
-        run_id: UUID,
-        query: Any,
-        **kwargs: Any,
-    ) -> None:
-        return None
-
-    async def on_retriever_end(
-        self,
-        run_id: UUID,
-        documents: Any,
-        **kwargs: Any,
-    ) -> None:
-        return None
-
-    async def on_retriever_error(
-        self,
-        error: BaseException,
-        *,
-        run_id: UUID,
-        **kwargs: Any,
-    ) -> None:
-        return None
+    hook.__name__ = template.__name__
+    hook.__qualname__ = f"AsyncCallbackHandler.{template.__name__}"
+    hook.__doc__ = template.__doc__
+    hook.__signature__ = inspect.signature(template).replace(return_annotation=None)
+    return hook
 
-    async def on_prompt_start(
-        self,
-        run_id: UUID,
-        inputs: Any,
-        **kwargs: Any,
-    ) -> None:
-        return None
 
-    async def on_prompt_end(
-        self,
-        run_id: UUID,
-        output: Any,
-        **kwargs: Any,
-    ) -> None:
-        return None
-
-    async def on_prompt_error(
-        self,
-        error: BaseException,
-        *,
-        run_id: UUID,
-        **kwargs: Any,
-    ) -> None:
-        return None
+# Chain hooks stay the synchronous mixin versions, as they always have
+for _mixin in (
+    LLMManagerMixin,
+    ToolManagerMixin,
+    RetrieverManagerMixin,
+    PromptManagerMixin,
+):
+    for _name, _template in vars(_mixin).items():
+        if _name.startswith("on_"):
+            setattr(AsyncCallbackHandler, _name, _async_noop_hook(_template))
+del _mixin, _name, _template
 
 
 CallbackHandlerLike = BaseCallbackHandler
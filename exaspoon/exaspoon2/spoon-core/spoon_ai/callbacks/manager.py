@@ -1,63 +1,294 @@
 import asyncio
-from typing import Any, Dict, List, Optional, Union
+import atexit
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
-from spoon_ai.callbacks.base import BaseCallbackHandler
+from spoon_ai.callbacks.base import (
+    AsyncCallbackHandler,
+    BaseCallbackHandler,
+    ChainManagerMixin,
+    LLMManagerMixin,
+    PromptManagerMixin,
+    RetrieverManagerMixin,
+    ToolManagerMixin,
+)
 from spoon_ai.schema import Message
 
+# Sync callbacks run here rather than on the loop's default executor, so
+# per-token handlers do not queue behind unrelated blocking work. Threads are
+# only started on first use.
+_CALLBACK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, os.cpu_count() or 4),
+    thread_name_prefix="spoon-cb",
+)
+atexit.register(_CALLBACK_EXECUTOR.shutdown, wait=False)
+
+# The do-nothing default hooks; a handler that still has one of these for an
+# event does not implement it and is skipped when dispatching that event
+_NOOP_HOOKS = frozenset(
+    hook
+    for owner in (
+        LLMManagerMixin,
+        ChainManagerMixin,
+        ToolManagerMixin,
+        RetrieverManagerMixin,
+        PromptManagerMixin,
+        AsyncCallbackHandler,
+    )
+    for name, hook in vars(owner).items()
+    if name.startswith("on_")
+)
+
+# _dispatchers key for on_llm_new_token handlers without a batch hook
+_UNBATCHED_TOKEN_EVENT = "on_llm_new_token/unbatched"
+
+Dispatcher = Callable[..., Awaitable[None]]
+
 
 class CallbackManager:
     """Lightweight dispatcher for callback handlers."""
 
-    def __init__(self, handlers: Optional[List[BaseCallbackHandler]] = None):
+    def __init__(
+        self,
+        handlers: Optional[List[BaseCallbackHandler]] = None,
+        *,
+        token_batch_size: int = 1,
+        token_batch_window_ms: float = 0.0,
+    ):
+        """
+        Args:
+            handlers: Callback handlers to dispatch to.
+            token_batch_size: Streamed tokens to coalesce before firing
+                handlers. ``1`` (the default) dispatches every token as it
+                arrives.
+            token_batch_window_ms: When batching, also flush a partial batch
+                this long after its first token. ``0`` flushes only on size,
+                on a new ``run_id`` or when the LLM ends or fails.
+        """
         self.handlers: List[BaseCallbackHandler] = list(handlers or [])
+        # event -> handlers that actually implement it, built on first dispatch
+        self._by_event: Dict[str, List[BaseCallbackHandler]] = {}
+        # event -> one awaitable callable per handler in _by_event[event]
+        self._dispatchers: Dict[str, List[Dispatcher]] = {}
+        # The handlers the two caches above were built from
+        self._cached_handlers: Tuple[BaseCallbackHandler, ...] = tuple(self.handlers)
+        self.token_batch_size = max(1, int(token_batch_size))
+        self.token_batch_window_ms = max(0.0, float(token_batch_window_ms))
+        # (token, chunk, run_id, kwargs) waiting for the next flush
+        self._token_buffer: List[Tuple[str, Any, Optional[UUID], Dict[str, Any]]] = []
+        self._token_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._token_flush_task: Optional["asyncio.Task[None]"] = None
+
+    def _batch_settings(self) -> Dict[str, Any]:
+        return {
+            "token_batch_size": self.token_batch_size,
+            "token_batch_window_ms": self.token_batch_window_ms,
+        }
 
     @classmethod
     def from_callbacks(cls,callbacks: Union[None,BaseCallbackHandler,List[BaseCallbackHandler],"CallbackManager",],
     ) -> "CallbackManager":
-        if callbacks is None:
-            return cls()
+        # Exact-type lookup covers the common None/list/manager arguments
+        # without walking the isinstance chain below
+        build = _FROM_CALLBACKS.get(type(callbacks))
+        if build is not None:
+            return build(cls, callbacks)
         if isinstance(callbacks, cls):
-            return cls(callbacks.handlers)
+            return _copy_manager(cls, callbacks)
         if isinstance(callbacks, BaseCallbackHandler):
             return cls([callbacks])
         if isinstance(callbacks, list):
-            valid = [handler for handler in callbacks if isinstance(handler, BaseCallbackHandler)]
-            return cls(valid)
+            return _from_list(cls, callbacks)
         return cls()
 
     def merge(self,other: Union[BaseCallbackHandler,List[BaseCallbackHandler],"CallbackManager",],
     ) -> "CallbackManager":
-        merged = CallbackManager.from_callbacks(other)
-        return CallbackManager(self.handlers + merged.handlers)
+        if isinstance(other, CallbackManager):
+            other_handlers = other.handlers
+        else:
+            other_handlers = CallbackManager.from_callbacks(other).handlers
+        if self is NOOP and not other_handlers:
+            return NOOP
+        return CallbackManager._adopt([*self.handlers, *other_handlers], **self._batch_settings())
+
+    @classmethod
+    def _adopt(cls, handlers: List[BaseCallbackHandler], **settings: Any) -> "CallbackManager":
+        """Build a manager that takes ownership of ``handlers`` without copying it."""
+        manager = cls(**settings)
+        manager.handlers = handlers
+        manager._cached_handlers = tuple(handlers)
+        return manager
+
+    def _sync_handler_caches(self) -> None:
+        handlers = tuple(self.handlers)
+        if handlers != self._cached_handlers:
+            # handlers was modified directly; rebuild lazily
+            self._by_event.clear()
+            self._dispatchers.clear()
+            self._cached_handlers = handlers
+
+    def _handlers_for(self, event: str) -> List[BaseCallbackHandler]:
+        self._sync_handler_caches()
+        handlers = self._by_event.get(event)
+        if handlers is None:
+            handlers = []
+            for handler in self.handlers:
+                if self._resolve(handler, event) is not None:
+                    handlers.append(handler)
+            self._by_event[event] = handlers
+        return handlers
+
+    def _dispatchers_for(self, event: str) -> List[Dispatcher]:
+        self._sync_handler_caches()
+        dispatchers = self._dispatchers.get(event)
+        if dispatchers is None:
+            dispatchers = [self._bind(handler, event) for handler in self._handlers_for(event)]
+            self._dispatchers[event] = dispatchers
+        return dispatchers
 
     async def _dispatch(self, event: str, **kwargs: Any) -> None:
         if not self.handlers:
             return
-        tasks = [self._invoke(handler, event, **kwargs) for handler in self.handlers]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._dispatch_to(self._dispatchers_for(event), **kwargs)
 
     @staticmethod
-    async def _invoke(handler: BaseCallbackHandler, event: str, **kwargs: Any) -> None:
-        callback = getattr(handler, event, None)
-        if callback is None:
+    async def _dispatch_to(dispatchers: List[Dispatcher], **kwargs: Any) -> None:
+        if not dispatchers:
             return
-        if asyncio.iscoroutinefunction(callback):
-            await callback(**kwargs)
+        if len(dispatchers) == 1:
+            # Common streaming setup: await directly instead of paying for gather
+            try:
+                await dispatchers[0](**kwargs)
+            except Exception:
+                pass
             return
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, lambda: callback(**kwargs))
+        # Run handlers concurrently but skip gather's result list and
+        # aggregate future; failures are swallowed one by one
+        tasks = [asyncio.ensure_future(dispatcher(**kwargs)) for dispatcher in dispatchers]
+        try:
+            for task in tasks:
+                try:
+                    await task
+                except Exception:
+                    pass
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @staticmethod
+    def _resolve(handler: BaseCallbackHandler, event: str) -> Optional[Callable[..., Any]]:
+        """``handler``'s hook for ``event``, or None if it only has the no-op default.
+
+        Looked up on the instance, so hooks assigned per handler are honoured.
+        """
+        hook = getattr(handler, event, None)
+        if hook is None or getattr(hook, "__func__", hook) in _NOOP_HOOKS:
+            return None
+        return hook
+
+    @classmethod
+    def _bind(cls, handler: BaseCallbackHandler, event: str) -> Dispatcher:
+        """Build the awaitable that runs ``handler``'s hook for ``event``.
+
+        The coroutine / inline / executor decision is made here, once per
+        handler and event, instead of on every dispatch.
+        """
+        hook = cls._resolve(handler, event)
+        if asyncio.iscoroutinefunction(hook):
+            return hook
+        if handler.run_inline:
+            # Handler declared its sync hooks non-blocking; skip the thread hop
+            async def call_inline(**kwargs: Any) -> None:
+                hook(**kwargs)
+
+            return call_inline
+
+        async def call_in_executor(**kwargs: Any) -> None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(_CALLBACK_EXECUTOR, partial(hook, **kwargs))
+
+        return call_in_executor
 
     async def on_llm_start(self,run_id: UUID,messages: List[Message],**kwargs: Any,) -> None:
         await self._dispatch("on_llm_start", run_id=run_id, messages=messages, **kwargs)
 
     async def on_llm_new_token(self,token: str,*,chunk: Optional[Any] = None,run_id: UUID = None,**kwargs: Any,) -> None:
-        await self._dispatch("on_llm_new_token",token=token,chunk=chunk,run_id=run_id,**kwargs,)
+        if self.token_batch_size == 1:
+            await self._dispatch("on_llm_new_token",token=token,chunk=chunk,run_id=run_id,**kwargs,)
+            return
+        if not self.handlers:
+            return
+        buffer = self._token_buffer
+        if buffer and buffer[-1][2] != run_id:
+            # Never mix two runs in one batch
+            await self._flush_tokens()
+            buffer = self._token_buffer
+        buffer.append((token, chunk, run_id, kwargs))
+        if len(buffer) >= self.token_batch_size:
+            await self._flush_tokens()
+        elif self.token_batch_window_ms and self._token_flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._token_flush_handle = loop.call_later(
+                self.token_batch_window_ms / 1000.0, self._start_timed_flush, loop
+            )
+
+    def _start_timed_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._token_flush_handle = None
+        self._token_flush_task = loop.create_task(self._flush_tokens())
+
+    async def _flush_tokens(self) -> None:
+        """Deliver buffered tokens, in order, to every handler.
+
+        Handlers that implement ``on_llm_new_token_batch`` get the whole batch
+        in one call; the rest still get ``on_llm_new_token`` once per token.
+        """
+        if self._token_flush_handle is not None:
+            self._token_flush_handle.cancel()
+            self._token_flush_handle = None
+        pending = self._token_flush_task
+        if pending is not None and pending is not asyncio.current_task():
+            # Let an in-flight timed flush finish first so batches stay ordered
+            self._token_flush_task = None
+            await pending
+        batch = self._token_buffer
+        if not batch:
+            return
+        self._token_buffer = []
+
+        batch_dispatchers = self._dispatchers_for("on_llm_new_token_batch")
+        if batch_dispatchers:
+            await self._dispatch_to(
+                batch_dispatchers,
+                tokens="".join(item[0] for item in batch),
+                chunks=[item[1] for item in batch],
+                run_id=batch[0][2],
+                **batch[-1][3],
+            )
+        token_dispatchers = self._dispatchers.get(_UNBATCHED_TOKEN_EVENT)
+        if token_dispatchers is None:
+            batch_handlers = self._handlers_for("on_llm_new_token_batch")
+            token_dispatchers = [
+                self._bind(handler, "on_llm_new_token")
+                for handler in self._handlers_for("on_llm_new_token")
+                if handler not in batch_handlers
+            ]
+            self._dispatchers[_UNBATCHED_TOKEN_EVENT] = token_dispatchers
+        if token_dispatchers:
+            for token, chunk, run_id, kwargs in batch:
+                await self._dispatch_to(token_dispatchers, token=token, chunk=chunk, run_id=run_id, **kwargs)
 
     async def on_llm_end(self,response: Any,*,run_id: UUID,**kwargs: Any,) -> None:
+        if self._token_buffer or self._token_flush_task is not None:
+            await self._flush_tokens()
         await self._dispatch("on_llm_end", response=response, run_id=run_id, **kwargs)
 
     async def on_llm_error(self,error: Exception,*,run_id: UUID,**kwargs: Any,) -> None:
+        if self._token_buffer or self._token_flush_task is not None:
+            await self._flush_tokens()
         await self._dispatch("on_llm_error", error=error, run_id=run_id, **kwargs)
 
     async def on_tool_start(self,tool_name: str,tool_input: Dict[str, Any],*,run_id: UUID,**kwargs: Any,) -> None:
@@ -81,4 +312,50 @@ class CallbackManager:
     async def on_prompt_end(self,run_id: UUID,output: Any,**kwargs: Any,) -> None:
         await self._dispatch("on_prompt_end", run_id=run_id, output=output, **kwargs)
 
+def _copy_manager(cls: type, manager: CallbackManager) -> CallbackManager:
+    return cls(manager.handlers, **manager._batch_settings())
+
+
+def _from_list(cls: type, callbacks: List[Any]) -> CallbackManager:
+    return cls([handler for handler in callbacks if isinstance(handler, BaseCallbackHandler)])
+
+
+class _NoopCallbackManager(CallbackManager):
+    """Manager with no handlers whose event methods return immediately.
+
+    Only the shared :data:`NOOP` instance exists. Its ``handlers`` is a
+    read-only empty tuple, since anything registered on it would reach every
+    user of the shared instance; use :meth:`merge` to get a manager with
+    handlers.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.handlers = ()  # type: ignore[assignment]
+
+
+async def _noop_event(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+for _name in [name for name in vars(CallbackManager) if name.startswith("on_")]:
+    setattr(_NoopCallbackManager, _name, _noop_event)
+del _name
+
+NOOP: CallbackManager = _NoopCallbackManager()
+"""Shared handler-less manager for call sites that never register handlers.
+
+The LLM streaming paths use it when no callbacks are passed, so each event
+returns at once. ``from_callbacks(None)`` still returns a fresh manager,
+whose ``handlers`` list the caller owns.
+"""
+
+# type(callbacks) -> builder(cls, callbacks) for CallbackManager.from_callbacks
+_FROM_CALLBACKS: Dict[type, Callable[[type, Any], CallbackManager]] = {
+    type(None): lambda cls, _callbacks: cls(),
+    list: _from_list,
+    CallbackManager: _copy_manager,
+    _NoopCallbackManager: lambda cls, _callbacks: NOOP if cls is CallbackManager else cls(),
+}
+
 AsyncCallbackManager = CallbackManager
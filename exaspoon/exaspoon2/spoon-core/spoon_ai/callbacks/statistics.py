@@ -30,12 +30,33 @@ class StreamingStatisticsCallback(BaseCallbackHandler, LLMManagerMixin):
     def reset(self) -> None:
         self.model: Optional[str] = None
         self.provider: Optional[str] = None
-        self.start_time: Optional[float] = None
-        self.end_time: Optional[float] = None
+        self.start_ns: Optional[int] = None
+        self.end_ns: Optional[int] = None
         self.token_count: int = 0
-        self.chunk_count: int = 0
         self.last_response: Optional[LLMResponse] = None
 
+    @property
+    def start_time(self) -> Optional[float]:
+        """``start_ns`` in seconds, on the ``time.perf_counter`` clock."""
+        return None if self.start_ns is None else self.start_ns / 1e9
+
+    @property
+    def end_time(self) -> Optional[float]:
+        """``end_ns`` in seconds, on the ``time.perf_counter`` clock."""
+        return None if self.end_ns is None else self.end_ns / 1e9
+
+    @property
+    def duration(self) -> float:
+        """Seconds between start and end, computed from the integer ns stamps."""
+        if self.start_ns is None or self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1e9
+
+    @property
+    def chunk_count(self) -> int:
+        """Streamed chunks seen; every token arrives as one chunk."""
+        return self.token_count
+
     async def on_llm_start(
         self,
         run_id: UUID,
@@ -48,7 +69,7 @@ class StreamingStatisticsCallback(BaseCallbackHandler, LLMManagerMixin):
         self.reset()
         self.model = model
         self.provider = provider
-        self.start_time = time.perf_counter()
+        self.start_ns = time.perf_counter_ns()
         if self.auto_print:
             self._print(
                 f"\n Streaming started with {model or 'unknown model'}"
@@ -64,7 +85,16 @@ class StreamingStatisticsCallback(BaseCallbackHandler, LLMManagerMixin):
         **_: Any,
     ) -> None:
         self.token_count += 1
-        self.chunk_count += 1
+
+    async def on_llm_new_token_batch(
+        self,
+        tokens: str,
+        *,
+        chunks: list[Optional[LLMResponseChunk]],
+        run_id: Optional[UUID] = None,
+        **_: Any,
+    ) -> None:
+        self.token_count += len(chunks)
 
     async def on_llm_end(
         self,
@@ -73,12 +103,12 @@ class StreamingStatisticsCallback(BaseCallbackHandler, LLMManagerMixin):
         run_id: UUID,
         **_: Any,
     ) -> None:
-        self.end_time = time.perf_counter()
+        self.end_ns = time.perf_counter_ns()
         self.last_response = response
         if not self.auto_print:
             return
 
-        duration = (self.end_time - self.start_time) if self.start_time else 0.0
+        duration = self.duration
         tokens_per_second = (
             (self.token_count / duration) if duration > 0 else float("inf")
         )
@@ -104,6 +134,6 @@ class StreamingStatisticsCallback(BaseCallbackHandler, LLMManagerMixin):
         run_id: UUID,
         **_: Any,
     ) -> None:
-        self.end_time = time.perf_counter()
+        self.end_ns = time.perf_counter_ns()
         if self.auto_print:
             self._print(f"\n Streaming error: {error}")
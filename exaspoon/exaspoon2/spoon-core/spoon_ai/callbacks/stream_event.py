@@ -1,14 +1,28 @@
 import asyncio
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from spoon_ai.callbacks.base import BaseCallbackHandler
 from spoon_ai.runnables.events import StreamEvent, StreamEventBuilder, StreamEventType
 from spoon_ai.utils.streaming import message_to_dict
 
+# Bound on memoized UUID -> str conversions kept per handler
+_ID_STR_CACHE_MAX = 256
+
+# Queue depth past which token events are sent without their chunk payload
+_CHUNK_BACKLOG_LIMIT = 1024
+
+# Callback kwargs that feed an LLM event's name, metadata or parent ids
+_LLM_EVENT_KEYS = frozenset({"model", "provider", "parent_ids", "parent_run_id"})
+
 
 class StreamEventCallbackHandler(BaseCallbackHandler):
-    """Translate callback invocations into standardized stream events."""
+    """Translate callback invocations into standardized stream events.
+
+    The hooks stay ``async`` but never suspend: events go onto the (unbounded)
+    queue with ``put_nowait``.
+    """
 
     def __init__(
         self,
@@ -17,11 +31,38 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
         root_run_id: UUID,
         tags: Optional[List[str]] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        serialize_chunks: bool = True,
+        chunk_backlog_limit: int = _CHUNK_BACKLOG_LIMIT,
     ) -> None:
+        """
+        Args:
+            event_queue: Unbounded queue that receives the events.
+            root_run_id: Run id used as parent when a hook names none.
+            tags: Tags attached to every event.
+            metadata: Metadata attached to every event.
+            serialize_chunks: Include each token's ``chunk.model_dump()`` in
+                ``on_llm_stream`` events. Disable when consumers only read
+                ``token``.
+            chunk_backlog_limit: While more than this many events are waiting
+                in the queue, token events omit the chunk payload so a slow
+                consumer does not pile up serialized chunks.
+        """
+        # Events are enqueued with put_nowait, which would raise QueueFull
+        # (and the event be dropped) on a bounded queue
+        if event_queue.maxsize > 0:
+            raise ValueError("StreamEventCallbackHandler requires an unbounded event queue")
         self._queue = event_queue
         self._root_run_id = root_run_id
+        self._root_run_id_str = str(root_run_id)
+        self._id_strs: Dict[Any, str] = {}
         self._default_tags = list(tags or [])
-        self._default_metadata = dict(metadata or {})
+        # Frozen so every event can be built straight from it without a
+        # defensive copy; events still get their own plain dict
+        self._default_metadata: "MappingProxyType[str, Any]" = MappingProxyType(dict(metadata or {}))
+        # run_id -> (name, metadata, parent_ids) of an LLM run, from on_llm_start
+        self._run_cache: Dict[Any, Tuple[str, Dict[str, Any], List[str]]] = {}
+        self._serialize_chunks = serialize_chunks
+        self._chunk_backlog_limit = chunk_backlog_limit
 
     async def on_llm_start(
         self,
@@ -29,18 +70,18 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
         messages: List[Any],
         **kwargs: Any,
     ) -> None:
-        name = self._resolve_name(kwargs.get("model"), kwargs.get("provider"), fallback="llm")
+        template = self._run_cache[run_id] = self._llm_event_fields(kwargs)
+        name, metadata, parent_ids = self._from_template(template)
         serialized_messages = [message_to_dict(m) for m in messages]
-        metadata = self._build_metadata(model=kwargs.get("model"), provider=kwargs.get("provider"))
         event = StreamEventBuilder.llm_start(
             run_id,
             name,
             serialized_messages,
-            parent_ids=self._parent_ids(kwargs),
+            parent_ids=parent_ids,
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_llm_new_token(
         self,
@@ -52,19 +93,26 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
     ) -> None:
         if run_id is None:
             return
-        name = self._resolve_name(kwargs.get("model"), kwargs.get("provider"), fallback="llm")
-        chunk_payload = chunk.model_dump() if hasattr(chunk, "model_dump") else chunk
-        metadata = self._build_metadata(model=kwargs.get("model"), provider=kwargs.get("provider"))
+        template = self._run_cache.get(run_id)
+        if template is not None and kwargs.keys().isdisjoint(_LLM_EVENT_KEYS):
+            # Hot path: everything but the token is fixed for the run
+            name, metadata, parent_ids = self._from_template(template)
+        else:
+            name, metadata, parent_ids = self._llm_event_fields(kwargs)
+        if not self._serialize_chunks or self._queue.qsize() > self._chunk_backlog_limit:
+            chunk_payload = None
+        else:
+            chunk_payload = chunk.model_dump() if hasattr(chunk, "model_dump") else chunk
         event = StreamEventBuilder.llm_stream(
-            run_id,
+            self._id_str(run_id),
             name,
             token=token,
             chunk=chunk_payload,
-            parent_ids=self._parent_ids(kwargs),
+            parent_ids=parent_ids,
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_llm_end(
         self,
@@ -73,18 +121,17 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
         run_id: UUID,
         **kwargs: Any,
     ) -> None:
-        name = self._resolve_name(kwargs.get("model"), kwargs.get("provider"), fallback="llm")
-        metadata = self._build_metadata(model=kwargs.get("model"), provider=kwargs.get("provider"))
+        name, metadata, parent_ids = self._finish_llm_run(run_id, kwargs)
         payload = response.model_dump() if hasattr(response, "model_dump") else response
         event = StreamEventBuilder.llm_end(
             run_id,
             name,
             response=payload,
-            parent_ids=self._parent_ids(kwargs),
+            parent_ids=parent_ids,
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_llm_error(
         self,
@@ -93,18 +140,17 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
         run_id: UUID,
         **kwargs: Any,
     ) -> None:
-        name = self._resolve_name(kwargs.get("model"), kwargs.get("provider"), fallback="llm")
-        metadata = self._build_metadata(model=kwargs.get("model"), provider=kwargs.get("provider"))
+        name, metadata, parent_ids = self._finish_llm_run(run_id, kwargs)
         event = StreamEventBuilder.error(
             StreamEventType.ON_LLM_ERROR,
             run_id,
             name,
             error,
-            parent_ids=self._parent_ids(kwargs),
+            parent_ids=parent_ids,
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_tool_start(
         self,
@@ -123,7 +169,7 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_tool_end(
         self,
@@ -142,7 +188,7 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_tool_error(
         self,
@@ -162,7 +208,7 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_retriever_start(
         self,
@@ -180,7 +226,7 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_retriever_end(
         self,
@@ -198,7 +244,7 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_prompt_start(
         self,
@@ -216,7 +262,7 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
 
     async def on_prompt_end(
         self,
@@ -234,33 +280,69 @@ class StreamEventCallbackHandler(BaseCallbackHandler):
             metadata=metadata,
             tags=self._default_tags,
         )
-        await self._queue.put(event)
+        self._queue.put_nowait(event)
+
+    def _llm_event_fields(self, kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any], List[str]]:
+        model = kwargs.get("model")
+        provider = kwargs.get("provider")
+        return (
+            self._resolve_name(model, provider, fallback="llm"),
+            self._build_metadata(model=model, provider=provider),
+            self._parent_ids(kwargs),
+        )
+
+    def _finish_llm_run(self, run_id: Any, kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any], List[str]]:
+        template = self._run_cache.pop(run_id, None)
+        if template is not None and kwargs.keys().isdisjoint(_LLM_EVENT_KEYS):
+            return self._from_template(template)
+        return self._llm_event_fields(kwargs)
+
+    @staticmethod
+    def _from_template(template: Tuple[str, Dict[str, Any], List[str]]) -> Tuple[str, Dict[str, Any], List[str]]:
+        """Event fields from a cached run template, in containers of the event's own."""
+        name, metadata, parent_ids = template
+        return name, dict(metadata), list(parent_ids)
 
     def _build_metadata(self, **overrides: Any) -> Dict[str, Any]:
-        metadata = dict(self._default_metadata)
+        defaults = self._default_metadata
+        simple: Optional[Dict[str, Any]] = None
+        nested: Optional[Dict[str, Dict[str, Any]]] = None
         for key, value in overrides.items():
             if value is None:
                 continue
             if isinstance(value, dict):
-                existing = metadata.get(key, {})
-                if isinstance(existing, dict):
-                    merged = dict(existing)
-                    merged.update(value)
-                    metadata[key] = merged
-                else:
-                    metadata[key] = value
+                if nested is None:
+                    nested = {}
+                nested[key] = value
             else:
-                metadata.setdefault(key, value)
+                if simple is None:
+                    simple = {}
+                simple[key] = value
+        # Defaults win over simple overrides, matching setdefault semantics
+        metadata = {**simple, **defaults} if simple else dict(defaults)
+        if nested:
+            for key, value in nested.items():
+                existing = defaults.get(key, {})
+                metadata[key] = {**existing, **value} if isinstance(existing, dict) else value
         return metadata
 
     def _parent_ids(self, kwargs: Dict[str, Any]) -> List[str]:
         parent_ids = kwargs.get("parent_ids")
         if parent_ids:
-            return [str(pid) for pid in parent_ids]
+            return [self._id_str(pid) for pid in parent_ids]
         parent_run_id = kwargs.get("parent_run_id")
         if parent_run_id:
-            return [str(parent_run_id)]
-        return [str(self._root_run_id)]
+            return [self._id_str(parent_run_id)]
+        return [self._root_run_id_str]
+
+    def _id_str(self, value: Any) -> str:
+        """``str(value)``, memoized since formatting a UUID is not free per token."""
+        cached = self._id_strs.get(value)
+        if cached is None:
+            if len(self._id_strs) >= _ID_STR_CACHE_MAX:
+                self._id_strs.clear()
+            cached = self._id_strs[value] = str(value)
+        return cached
 
     @staticmethod
     def _resolve_name(*candidates: Optional[str], fallback: str) -> str:
@@ -1,31 +1,75 @@
 import sys
-from typing import Any
+from typing import Any, List
 from uuid import UUID
 
 from spoon_ai.callbacks.base import BaseCallbackHandler
 
 
 class StreamingStdOutCallbackHandler(BaseCallbackHandler):
-    """Callback handler that streams tokens to standard output."""
+    """Callback handler that streams tokens to standard output.
+
+    Tokens are buffered and written out on each newline or once
+    ``flush_threshold`` characters have accumulated, rather than flushing
+    stdout once per token.
+    """
+
+    # Writing a token to stdout is cheap; run on the loop instead of a worker thread
+    run_inline = True
+
+    def __init__(self, flush_threshold: int = 256) -> None:
+        self.flush_threshold = flush_threshold
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def _write(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered > self.flush_threshold or "\n" in text:
+            self._flush()
+
+    def _flush(self, tail: str = "") -> None:
+        if self._buffer:
+            sys.stdout.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        if tail:
+            sys.stdout.write(tail)
+        sys.stdout.flush()
     
     def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
-        """Print token to stdout immediately.
+        """Buffer token for stdout, writing out on newline or a full buffer.
             Args:
             token: The new token to print
             **kwargs: Additional context (ignored)
         """
-        sys.stdout.write(token)
-        sys.stdout.flush()
+        self._write(token)
+
+    def on_llm_new_token_batch(self, tokens: str, **kwargs: Any) -> None:
+        """Buffer a batch of tokens for stdout.
+
+        Args:
+            tokens: The batched tokens joined into one string
+            **kwargs: Additional context (ignored)
+        """
+        self._write(tokens)
     
     def on_llm_end(self, response: Any, **kwargs: Any) -> None:
-        """Print newline after LLM completes.
+        """Write out any buffered tokens and a newline after LLM completes.
         
         Args:
             response: The complete LLM response (ignored)
             **kwargs: Additional context (ignored)
         """
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        self._flush("\n")
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        """Write out any buffered tokens so partial output is not lost.
+
+        Args:
+            error: The error raised by the LLM (ignored)
+            **kwargs: Additional context (ignored)
+        """
+        self._flush()
 
 
 
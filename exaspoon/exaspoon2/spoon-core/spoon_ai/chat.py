@@ -795,12 +795,14 @@ class ChatBot:
             messages, system_msg, callbacks
         )
         stream_kwargs = sanitize_stream_kwargs(kwargs)
+        # Serialized once and shared by every event below, like raw_messages_dump
+        processed_messages_dump = [msg.model_dump() for msg in processed_messages]
         
         # Chain start event
         yield StreamEventBuilder.chain_start(
             chain_run_id,
             component_name,
-            inputs={"messages": [msg.model_dump() for msg in processed_messages]},
+            inputs={"messages": processed_messages_dump},
             metadata={"provider": self.llm_provider, "model": self.model_name},
         )
 
@@ -816,7 +818,7 @@ class ChatBot:
         yield StreamEventBuilder.prompt_end(
             prompt_run_id,
             f"{component_name}.prompt",
-            output={"messages": [msg.model_dump() for msg in processed_messages]},
+            output={"messages": processed_messages_dump},
             parent_ids=[str(chain_run_id)],
             metadata={"model": self.model_name},
         )
@@ -833,7 +835,7 @@ class ChatBot:
             yield StreamEventBuilder.retriever_end(
                 retriever_run_id,
                 self.short_term_memory_manager.__class__.__name__,
-                documents={"messages": [msg.model_dump() for msg in processed_messages]},
+                documents={"messages": processed_messages_dump},
                 parent_ids=[str(chain_run_id)],
             )
         
@@ -841,7 +843,7 @@ class ChatBot:
         yield StreamEventBuilder.llm_start(
             llm_run_id,
             llm_name,
-            messages=[msg.model_dump() for msg in processed_messages],
+            messages=processed_messages_dump,
             model=self.model_name,
             provider=self.llm_provider,
             parent_ids=[str(chain_run_id)],
@@ -2,14 +2,22 @@
 GraphAgent implementation for the graph package.
 """
 import asyncio
+import atexit
+import bisect
 import time
 import json
 import os
+import re
+import threading
+import weakref
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
+import orjson
+
 from .engine import StateGraph
 
 
@@ -23,14 +31,125 @@ class AgentStateCheckpoint:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-class Memory:
-    """Memory implementation with persistent storage"""
+_LOG_LINE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+
+def _dump_log_line(msg: Dict[str, Any]) -> bytes:
+    """Encode one message as a JSON-lines record."""
+    try:
+        return orjson.dumps(msg, option=_LOG_LINE_OPTIONS)
+    except orjson.JSONEncodeError:
+        # e.g. integers beyond 64 bits, which only the stdlib encoder handles
+        return json.dumps(msg, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+_WORD_RE = re.compile(r"\w+")
+# Length of the word fragments indexed for substring search
+_GRAM = 3
+_NO_POSITIONS: frozenset = frozenset()
+
+
+def _word_grams(word: str) -> Set[str]:
+    """Every ``_GRAM``-character fragment of ``word``."""
+    return {word[i:i + _GRAM] for i in range(len(word) - _GRAM + 1)}
+
+_VALID_ROLES = frozenset({'user', 'assistant', 'tool', 'system'})
+_CONTENT_TYPES = (str, type(None))
+_MISSING = object()
+
+# Size limits (approximate repr length) for preserved state and its values
+_MAX_STATE = 10000
+_MAX_STATE_VALUE = 1000
+
+
+def _approx_size(obj: Any, limit: int) -> int:
+    """Approximate ``len(str(obj))`` without building the string.
+
+    Walks containers, counting string lengths plus repr punctuation, and
+    stops as soon as the running total exceeds ``limit`` (the returned value
+    is then only known to be larger than ``limit``).
+    """
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            total += len(item) + 2
+        elif isinstance(item, dict):
+            # braces, ": " per item and ", " between items
+            total += 2 + 4 * len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            total += 2 * len(item) + 2
+            stack.extend(item)
+        else:
+            total += len(str(item))
+        if total > limit:
+            return total
+    return total
+
+
+# Memories with writes still waiting for their debounce timer
+_PENDING_FLUSH: "weakref.WeakSet[Memory]" = weakref.WeakSet()
+
 
-    def __init__(self, storage_path: Optional[str] = None, session_id: Optional[str] = None):
+@atexit.register
+def _flush_pending_memories() -> None:
+    for memory in list(_PENDING_FLUSH):
+        memory.flush()
+
+
+class Memory:
+    """Memory implementation with persistent storage
+
+    Messages are kept in an append-only JSON-lines log (``<session>.jsonl``),
+    one message per line; metadata lives in a small ``<session>.meta.json``
+    that is only rewritten when metadata changes. A session saved in the old
+    single-document ``<session>.json`` format is loaded and migrated on the
+    next write.
+
+    Inside a running event loop, mutations are coalesced: pending changes are
+    written once ``flush_delay`` seconds after the first unsaved change, or
+    earlier via :meth:`flush`. Without a running loop every change is written
+    immediately.
+
+    Stored messages are treated as immutable: the log, the search index and
+    the parsed timestamps only pick up appended messages or a replaced
+    ``messages`` list. To change a stored message, assign a new list or use
+    :meth:`bulk_replace` instead of editing the dict in place.
+    """
+
+    def __init__(self, storage_path: Optional[str] = None, session_id: Optional[str] = None, flush_delay: float = 0.2):
         self.session_id = session_id or f"session_{int(time.time())}"
         self.storage_path = Path(storage_path) if storage_path else Path.home() / ".spoon_ai" / "memory"
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        self.session_file = self.storage_path / f"{self.session_id}.json"
+        self.session_file = self.storage_path / f"{self.session_id}.jsonl"
+        self.meta_file = self.storage_path / f"{self.session_id}.meta.json"
+        self.flush_delay = flush_delay
+        self._dirty = False
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Append log state: the list and prefix length already on disk
+        self._fh = None
+        self._persisted_list: Optional[List[Dict[str, Any]]] = None
+        self._persisted_count = 0
+        self._meta_dirty = False
+        # Serializes writes between the loop thread and flushes run in a worker
+        self._io_lock = threading.RLock()
+        # Search index: lowercased word -> positions in messages, plus every
+        # _GRAM-character fragment of those words -> positions. Built lazily
+        # for the list it was computed from and extended with new messages.
+        self._index: Dict[str, Set[int]] = defaultdict(set)
+        self._gram_index: Dict[str, Set[int]] = defaultdict(set)
+        self._indexed_list: Optional[List[Dict[str, Any]]] = None
+        self._indexed_count = 0
+        # Parsed message timestamps (epoch seconds, None when unparsable),
+        # aligned with the messages list they were computed from
+        self._ts_list: List[Optional[float]] = []
+        self._ts_source: Optional[List[Dict[str, Any]]] = None
+        # True while _ts_list has no None and never decreases (bisectable)
+        self._ts_monotonic = True
 
         # Load existing data
         self.messages = []
@@ -41,82 +160,285 @@ class Memory:
         """Load memory data from disk"""
         try:
             if self.session_file.exists():
-                with open(self.session_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.messages = data.get('messages', [])
-                    self.metadata = data.get('metadata', {})
+                messages = []
+                with open(self.session_file, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            messages.append(orjson.loads(line))
+                self.messages = messages
+                if self.meta_file.exists():
+                    with open(self.meta_file, 'rb') as f:
+                        self.metadata = orjson.loads(f.read()).get('metadata', {})
+                self._persisted_list = self.messages
+                self._persisted_count = len(self.messages)
+            else:
+                legacy_file = self.session_file.with_suffix('.json')
+                if legacy_file.exists():
+                    with open(legacy_file, 'rb') as f:
+                        data = orjson.loads(f.read())
+                        self.messages = data.get('messages', [])
+                        self.metadata = data.get('metadata', {})
+                    # Not in the log yet: the next write rewrites it in full
+                    self._meta_dirty = True
         except Exception as e:
             print(f"Warning: Failed to load memory from disk: {e}")
             self.messages = []
             self.metadata = {}
 
+    def _schedule_flush(self):
+        """Mark memory dirty and arrange for a single deferred write"""
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous caller: nothing to coalesce with, write now
+            self._save_to_disk()
+            return
+        if self._flush_handle is not None:
+            if self._flush_loop is loop:
+                return
+            # Timer belongs to a loop that is gone or no longer ours
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_later(self.flush_delay, self._flush_in_background, loop)
+        self._flush_loop = loop
+        _PENDING_FLUSH.add(self)
+
+    def _flush_in_background(self, loop: asyncio.AbstractEventLoop):
+        self._flush_handle = None
+        _PENDING_FLUSH.discard(self)
+        # Keep the disk write off the event loop
+        loop.run_in_executor(None, self._write_pending)
+
+    def flush(self):
+        """Write pending changes to disk now"""
+        if self._dirty:
+            self._save_to_disk()
+
+    async def aflush(self):
+        """Write pending changes to disk from a worker thread"""
+        if self._dirty:
+            self._cancel_scheduled_flush()
+            await asyncio.to_thread(self._write_pending)
+
+    def _cancel_scheduled_flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        _PENDING_FLUSH.discard(self)
+
     def _save_to_disk(self):
         """Save memory data to disk"""
-        try:
-            data = {
-                'messages': self.messages,
-                'metadata': self.metadata,
-                'last_updated': datetime.now().isoformat(),
-                'session_id': self.session_id
-            }
-            with open(self.session_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Warning: Failed to save memory to disk: {e}")
+        self._cancel_scheduled_flush()
+        self._write_pending()
+
+    def _write_pending(self):
+        # May run in a worker thread while the loop keeps appending messages
+        with self._io_lock:
+            self._dirty = False
+            try:
+                messages = self.messages
+                end = len(messages)
+                if messages is self._persisted_list and end >= self._persisted_count:
+                    # Common case: only new messages to append
+                    pending = messages[self._persisted_count:end]
+                    if pending:
+                        fh = self._fh
+                        if fh is None:
+                            fh = self._fh = open(self.session_file, 'ab', buffering=1 << 16)
+                        fh.write(b''.join(map(_dump_log_line, pending)))
+                        fh.flush()
+                        self._persisted_count = end
+                else:
+                    self.compact()
+                if self._meta_dirty:
+                    self._save_metadata()
+            except Exception as e:
+                print(f"Warning: Failed to save memory to disk: {e}")
+
+    def _save_metadata(self):
+        data = {
+            'metadata': self.metadata,
+            'last_updated': datetime.now().isoformat(),
+            'session_id': self.session_id
+        }
+        with open(self.meta_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        self._meta_dirty = False
+
+    def compact(self):
+        """Rewrite the message log from the in-memory messages
+
+        Needed after messages were removed or edited in place; appends alone
+        never require it. The new log replaces the old one atomically.
+        """
+        with self._io_lock:
+            self.close()
+            messages = self.messages
+            end = len(messages)
+            tmp_file = self.session_file.with_name(self.session_file.name + '.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(b''.join(map(_dump_log_line, messages[:end])))
+            os.replace(tmp_file, self.session_file)
+            self._persisted_list = messages
+            self._persisted_count = end
+
+    def close(self):
+        """Close the message log handle; it is reopened on the next append"""
+        with self._io_lock:
+            if self._fh is not None:
+                try:
+                    self._fh.close()
+                finally:
+                    self._fh = None
 
     def clear(self):
         """Clear all messages and reset memory"""
         self.messages = []
         self.metadata = {}
-        self._save_to_disk()
+        self._meta_dirty = True
+        self._schedule_flush()
 
-    def add_message(self, msg):
-        """Add a message to memory"""
+    @staticmethod
+    def _to_message_dict(msg) -> Dict[str, Any]:
+        """Convert ``msg`` to a dict owned by this memory"""
         # Convert message to dict if it's an object
         if hasattr(msg, '__dict__'):
-            msg_dict = msg.__dict__.copy()
-        elif isinstance(msg, dict):
-            msg_dict = msg.copy()
-        else:
-            msg_dict = {'content': str(msg)}
+            return msg.__dict__.copy()
+        if isinstance(msg, dict):
+            return msg.copy()
+        return {'content': str(msg)}
+
+    def add_message(self, msg):
+        """Add a message to memory"""
+        msg_dict = self._to_message_dict(msg)
 
         # Add timestamp if not present
         if 'timestamp' not in msg_dict:
-            msg_dict['timestamp'] = datetime.now().isoformat()
+            now = datetime.now()
+            msg_dict['timestamp'] = now.isoformat()
+            if self._ts_source is self.messages and len(self._ts_list) == len(self.messages):
+                # Already known; saves parsing it back in get_recent_messages
+                self._append_timestamp(now.timestamp())
 
         self.messages.append(msg_dict)
-        self._save_to_disk()
+        self._schedule_flush()
+
+    def bulk_replace(self, msgs):
+        """Replace all messages at once
 
-    def get_messages(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get messages from memory"""
+        Equivalent to clearing the messages and adding each of ``msgs``, but
+        the log is rewritten once instead of once per message.
+        """
+        messages = []
+        for msg in msgs:
+            msg_dict = self._to_message_dict(msg)
+            if 'timestamp' not in msg_dict:
+                msg_dict['timestamp'] = datetime.now().isoformat()
+            messages.append(msg_dict)
+        self.messages = messages
+        self._schedule_flush()
+
+    def get_messages(self, limit: Optional[int] = None, copy: bool = False) -> List[Dict[str, Any]]:
+        """Get messages from memory
+
+        Without ``limit`` and ``copy`` this is the live message list, returned
+        without copying: callers must not mutate it. Pass ``copy=True`` for a
+        list of your own.
+        """
         if limit and len(self.messages) > limit:
             return self.messages[-limit:]
-        return self.messages.copy()
+        return self.messages.copy() if copy else self.messages
+
+    def _sync_timestamps(self) -> List[Optional[float]]:
+        messages = self.messages
+        if messages is not self._ts_source or len(messages) < len(self._ts_list):
+            self._ts_list = []
+            self._ts_source = messages
+            self._ts_monotonic = True
+        for position in range(len(self._ts_list), len(messages)):
+            try:
+                msg_time = datetime.fromisoformat(messages[position]['timestamp']).timestamp()
+            except Exception:
+                msg_time = None
+            self._append_timestamp(msg_time)
+        return self._ts_list
+
+    def _append_timestamp(self, msg_time: Optional[float]):
+        ts_list = self._ts_list
+        if self._ts_monotonic and (msg_time is None or (ts_list and msg_time < ts_list[-1])):
+            self._ts_monotonic = False
+        ts_list.append(msg_time)
 
     def get_recent_messages(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get messages from the last N hours"""
         cutoff_time = datetime.now().timestamp() - (hours * 3600)
-        recent_messages = []
+        ts_list = self._sync_timestamps()
+        if self._ts_monotonic:
+            # Appended in time order: everything from the cutoff on is recent
+            return self.messages[bisect.bisect_left(ts_list, cutoff_time):]
 
-        for msg in self.messages:
-            if 'timestamp' in msg:
-                try:
-                    msg_time = datetime.fromisoformat(msg['timestamp']).timestamp()
-                    if msg_time >= cutoff_time:
-                        recent_messages.append(msg)
-                except:
-                    recent_messages.append(msg)
-            else:
+        recent_messages = []
+        # Messages without a usable timestamp are always included
+        for msg, msg_time in zip(self.messages, ts_list):
+            if msg_time is None or msg_time >= cutoff_time:
                 recent_messages.append(msg)
 
         return recent_messages
 
+    def _sync_index(self) -> Tuple[Dict[str, Set[int]], Dict[str, Set[int]]]:
+        messages = self.messages
+        if messages is not self._indexed_list or len(messages) < self._indexed_count:
+            self._index = defaultdict(set)
+            self._gram_index = defaultdict(set)
+            self._indexed_list = messages
+            self._indexed_count = 0
+        index, gram_index = self._index, self._gram_index
+        for position in range(self._indexed_count, len(messages)):
+            content = str(messages[position].get('content', '')).lower()
+            words = set(_WORD_RE.findall(content))
+            grams = set()
+            for word in words:
+                index[word].add(position)
+                grams |= _word_grams(word)
+            for gram in grams:
+                gram_index[gram].add(position)
+        self._indexed_count = len(messages)
+        return index, gram_index
+
     def search_messages(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search messages containing the query"""
         query_lower = query.lower()
         matching_messages = []
 
-        for msg in reversed(self.messages):  # Search from most recent
+        candidates: Optional[Set[int]] = None
+        words = list(_WORD_RE.finditer(query_lower))
+        if words:
+            index, gram_index = self._sync_index()
+            for match in words:
+                word = match.group()
+                if match.start() > 0 and match.end() < len(query_lower):
+                    # Delimited on both sides in the query, so a whole word in content
+                    postings = index.get(word, _NO_POSITIONS)
+                elif len(word) >= _GRAM:
+                    # May be the head/tail of a longer word in content, which
+                    # then contains every fragment of this one
+                    postings = None
+                    for gram in _word_grams(word):
+                        found = gram_index.get(gram, _NO_POSITIONS)
+                        postings = found if postings is None else postings & found
+                else:
+                    # Too short to narrow anything down; checked below
+                    continue
+                candidates = postings if candidates is None else candidates & postings
+                if not candidates:
+                    return []
+        if candidates is not None:
+            positions = sorted(candidates, reverse=True)
+        else:
+            positions = range(len(self.messages) - 1, -1, -1)
+
+        for position in positions:  # Search from most recent
+            msg = self.messages[position]
             content = str(msg.get('content', '')).lower()
             if query_lower in content:
                 matching_messages.append(msg)
@@ -138,7 +460,8 @@ class Memory:
     def set_metadata(self, key: str, value: Any):
         """Set metadata"""
         self.metadata[key] = value
-        self._save_to_disk()
+        self._meta_dirty = True
+        self._schedule_flush()
 
     def get_metadata(self, key: str, default: Any = None) -> Any:
         """Get metadata"""
@@ -172,7 +495,7 @@ class GraphAgent:
 
     async def run(self, request: Optional[str] = None) -> str:
         async with self._state_lock:
-            checkpoint = self._create_checkpoint()
+            snapshot = self._snapshot()
             try:
                 initial_state = {"input": request} if request else {}
                 if self.preserve_state and self._last_state:
@@ -190,18 +513,60 @@ class GraphAgent:
                 }
                 return str(result.get("output", result))
             except Exception as error:
-                await self._handle_execution_error(error, checkpoint)
+                await self._handle_execution_error(error, self._checkpoint_from_snapshot(snapshot))
                 raise
+            finally:
+                await self._aflush_memory()
+
+    def _flush_memory(self):
+        try:
+            if self.memory and hasattr(self.memory, 'flush'):
+                self.memory.flush()
+        except Exception:
+            pass
+
+    async def _aflush_memory(self):
+        try:
+            if self.memory and hasattr(self.memory, 'aflush'):
+                await self.memory.aflush()
+            else:
+                await asyncio.to_thread(self._flush_memory)
+        except Exception:
+            pass
 
     def _create_checkpoint(self) -> AgentStateCheckpoint:
         messages = []
         if self.memory and hasattr(self.memory, 'get_messages'):
             try:
+                # Filtering already builds a new list; no need for get_messages to copy
                 messages = [m for m in self.memory.get_messages() if self._validate_message(m)]
             except Exception:
                 messages = []
         return AgentStateCheckpoint(messages=messages, current_step=self.current_step, agent_state=self.state, preserved_state=self._last_state.copy() if self._last_state else None)
 
+    def _snapshot(self) -> tuple:
+        """O(1) pre-run state; the full checkpoint is only built if the run fails.
+
+        Memory only ever appends to its messages list or replaces it, so
+        holding the list and its current length is enough to recover the
+        pre-run messages later. Other memory types are checkpointed eagerly.
+        """
+        if isinstance(self.memory, Memory):
+            messages = self.memory.messages
+            return (self.current_step, self.state, self._last_state, messages, len(messages), None)
+        return (None, None, None, None, 0, self._create_checkpoint())
+
+    def _checkpoint_from_snapshot(self, snapshot: tuple) -> AgentStateCheckpoint:
+        current_step, state, last_state, messages, count, checkpoint = snapshot
+        if checkpoint is not None:
+            return checkpoint
+        return AgentStateCheckpoint(
+            messages=[m for m in messages[:count] if self._validate_message(m)],
+            current_step=current_step,
+            agent_state=state,
+            preserved_state=last_state.copy() if last_state else None,
+        )
+
     async def _handle_execution_error(self, error: Exception, checkpoint: AgentStateCheckpoint):
         try:
             self._restore_from_checkpoint(checkpoint)
@@ -225,8 +590,11 @@ class GraphAgent:
             for msg in checkpoint.messages:
                 if self._validate_message(msg):
                     valid.append(msg)
-            for msg in valid:
-                self.memory.add_message(msg)
+            if hasattr(self.memory, 'bulk_replace'):
+                self.memory.bulk_replace(valid)
+            else:
+                for msg in valid:
+                    self.memory.add_message(msg)
             self.current_step = checkpoint.current_step
             self.state = checkpoint.agent_state
             if checkpoint.preserved_state and self._validate_preserved_state(checkpoint.preserved_state):
@@ -237,22 +605,17 @@ class GraphAgent:
             self._emergency_reset()
 
     def _validate_message(self, msg) -> bool:
-        try:
-            if not hasattr(msg, 'role') or not hasattr(msg, 'content'):
-                return False
-            if getattr(msg, 'role') not in ['user', 'assistant', 'tool', 'system']:
-                return False
-            if not isinstance(getattr(msg, 'content', None), (str, type(None))):
-                return False
-            return True
-        except Exception:
+        # str check first: keeps unhashable roles away from the set lookup
+        role = getattr(msg, 'role', None)
+        if not isinstance(role, str) or role not in _VALID_ROLES:
             return False
+        return isinstance(getattr(msg, 'content', _MISSING), _CONTENT_TYPES)
 
     def _validate_preserved_state(self, state: Any) -> bool:
         try:
             if not isinstance(state, dict):
                 return False
-            if len(str(state)) > 10000:
+            if _approx_size(state, _MAX_STATE) > _MAX_STATE:
                 return False
             return True
         except Exception:
@@ -268,7 +631,7 @@ class GraphAgent:
                     continue
                 if isinstance(v, (str, int, float, bool, type(None))):
                     sanitized[k] = v
-                elif isinstance(v, (list, dict)) and len(str(v)) <= 1000:
+                elif isinstance(v, (list, dict)) and _approx_size(v, _MAX_STATE_VALUE) <= _MAX_STATE_VALUE:
                     sanitized[k] = v
             return sanitized
         except Exception:
@@ -351,6 +714,8 @@ class GraphAgent:
         """Manually save current session"""
         if hasattr(self.memory, '_save_to_disk'):
             self.memory._save_to_disk()
+        elif hasattr(self.memory, 'flush'):
+            self.memory.flush()
 
     def load_session(self, session_id: str):
         """Load a specific session"""
@@ -359,6 +724,8 @@ class GraphAgent:
             memory_class = self.memory.__class__
             if memory_class == Memory or memory_class == MockMemory:
                 old_session = self.memory.session_id
+                self._flush_memory()
+                self.memory.close()
                 new_memory = memory_class(session_id=session_id)
                 self.memory = new_memory
                 print(f"Switched from session '{old_session}' to '{session_id}'")
@@ -20,7 +20,7 @@ from .monitoring import DebugLogger, MetricsCollector, get_debug_logger, get_met
 from .response_normalizer import ResponseNormalizer, get_response_normalizer
 from .errors import ProviderError, ConfigurationError, ProviderUnavailableError
 from spoon_ai.callbacks.base import BaseCallbackHandler
-from spoon_ai.callbacks.manager import CallbackManager
+from spoon_ai.callbacks.manager import NOOP, CallbackManager
 
 logger = getLogger(__name__)
 
@@ -601,7 +601,7 @@ class LLMManager:
         # Create callback manager with internal monitoring callbacks
         internal_callbacks = self._get_internal_callbacks()
         all_callbacks = internal_callbacks + (callbacks or [])
-        callback_manager = CallbackManager.from_callbacks(all_callbacks)
+        callback_manager = CallbackManager.from_callbacks(all_callbacks) if all_callbacks else NOOP
 
         # Log request
         request_id = self.debug_logger.log_request(provider_name, 'chat_stream', kwargs)
@@ -12,7 +12,7 @@ from anthropic import AsyncAnthropic
 from httpx import AsyncClient
 
 from spoon_ai.schema import Message, ToolCall, Function, LLMResponseChunk
-from spoon_ai.callbacks.manager import CallbackManager
+from spoon_ai.callbacks.manager import NOOP, CallbackManager
 from ..interface import LLMProviderInterface, LLMResponse, ProviderMetadata, ProviderCapability
 from ..errors import ProviderError, AuthenticationError, RateLimitError, ModelNotFoundError, NetworkError
 from ..registry import register_provider
@@ -239,8 +239,8 @@ class AnthropicProvider(LLMProviderInterface):
         if not self.client:
             raise ProviderError("anthropic", "Provider not initialized")
 
-        # Create callback manager
-        callback_manager = CallbackManager.from_callbacks(callbacks)
+        # Create callback manager; without handlers every event is a no-op
+        callback_manager = CallbackManager.from_callbacks(callbacks) if callbacks else NOOP
         run_id = uuid4()
         
         try:
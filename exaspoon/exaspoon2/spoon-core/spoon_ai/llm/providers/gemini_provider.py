@@ -15,7 +15,7 @@ from google import genai
 from google.genai import types
 
 from spoon_ai.schema import Message, ToolCall, Function, LLMResponseChunk
-from spoon_ai.callbacks.manager import CallbackManager
+from spoon_ai.callbacks.manager import NOOP, CallbackManager
 from ..interface import LLMProviderInterface, LLMResponse, ProviderMetadata, ProviderCapability
 from ..errors import ProviderError, AuthenticationError, RateLimitError, ModelNotFoundError, NetworkError
 from ..registry import register_provider
@@ -254,8 +254,8 @@ class GeminiProvider(LLMProviderInterface):
         if not self.client:
             raise ProviderError("gemini", "Provider not initialized")
 
-        # Create callback manager
-        callback_manager = CallbackManager.from_callbacks(callbacks)
+        # Create callback manager; without handlers every event is a no-op
+        callback_manager = CallbackManager.from_callbacks(callbacks) if callbacks else NOOP
         run_id = uuid4()
         
         try:
@@ -16,7 +16,7 @@ from spoon_ai.schema import Message, ToolCall, Function, LLMResponseChunk
 from ..interface import LLMProviderInterface, LLMResponse, ProviderMetadata, ProviderCapability
 from ..errors import ProviderError, AuthenticationError, RateLimitError, ModelNotFoundError, NetworkError
 from spoon_ai.callbacks.base import BaseCallbackHandler
-from spoon_ai.callbacks.manager import CallbackManager
+from spoon_ai.callbacks.manager import NOOP, CallbackManager
 
 logger = getLogger(__name__)
 
@@ -281,8 +281,8 @@ class OpenAICompatibleProvider(LLMProviderInterface):
         if not self.client:
             raise ProviderError(self.get_provider_name(), "Provider not initialized")
 
-        # Create callback manager
-        callback_manager = CallbackManager.from_callbacks(callbacks)
+        # Create callback manager; without handlers every event is a no-op
+        callback_manager = CallbackManager.from_callbacks(callbacks) if callbacks else NOOP
         run_id = uuid4()
         
         try:
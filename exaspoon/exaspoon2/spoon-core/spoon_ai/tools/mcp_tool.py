@@ -66,6 +66,8 @@ class MCPTool(BaseTool, MCPClientMixin):
         # Also apply per-transport override if present
         if isinstance(self._connection_timeout, (int, float)) and self._connection_timeout <= 0:
             self._connection_timeout = 30
+        # Budget for the agent-side schema preload, derived once from the connection timeout
+        self._preload_timeout = max(15.0, min(float(self._connection_timeout) + 10.0, 60.0))
         self._max_retries = mcp_config.get('max_retries', 3)
 
         logger.info(f"Initialized MCP tool '{self.name}' with deferred parameter loading")
@@ -225,6 +227,9 @@ class MCPTool(BaseTool, MCPClientMixin):
             "required": ["tool_name"]
         }:
             await self._fetch_and_set_parameters()
+        else:
+            # An explicit schema was configured, so there is nothing to fetch
+            self._parameters_loaded = True
 
     async def execute(self, **kwargs) -> Any:
         actual_tool_name = self.name
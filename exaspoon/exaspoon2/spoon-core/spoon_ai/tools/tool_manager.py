@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, Iterator, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from openai import OpenAI
 import pinecone
@@ -8,14 +8,54 @@ from spoon_ai.tools.base import BaseTool, ToolFailure, ToolResult
 
 
 class ToolManager:
-    def __init__(self, tools: List[BaseTool]):
-        self.tools = tools
-        self.tool_map = {tool.name: tool for tool in tools}
+    def __init__(self, tools: Optional[List[BaseTool]] = None):
+        self._version = 0
+        self._mcp_tools: Optional[List[BaseTool]] = None
+        self._params_cache: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        self.tools = tools if tools is not None else []
+        self.tool_map = {tool.name: tool for tool in self.tools}
         self.indexed = False
 
+    @property
+    def tools(self) -> List[BaseTool]:
+        return self._tools
+
+    @tools.setter
+    def tools(self, tools: List[BaseTool]) -> None:
+        self._tools = tools
+        self.mark_dirty()
+
+    @property
+    def tool_map(self) -> Dict[str, BaseTool]:
+        return self._tool_map
+
+    @tool_map.setter
+    def tool_map(self, tool_map: Dict[str, BaseTool]) -> None:
+        self._tool_map = tool_map
+        self.mark_dirty()
+
     def reindex(self) -> None:
         """Rebuild the internal name->tool mapping. Useful if tools have been renamed dynamically."""
         self.tool_map = {tool.name: tool for tool in self.tools}
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """Drop derived caches. Call after mutating `tools`/`tool_map` in place;
+        assigning either attribute does it automatically."""
+        self._mcp_tools = None
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every mutation; lets callers key their own caches."""
+        return self._version
+
+    @property
+    def mcp_tools(self) -> List[BaseTool]:
+        """Tools backed by an MCP server, recomputed only after a mutation."""
+        if self._mcp_tools is None:
+            self._mcp_tools = [tool for tool in self.tool_map.values() if hasattr(tool, 'mcp_config')]
+        return self._mcp_tools
 
 
     def _lazy_init_pinecone(self):
@@ -45,6 +85,19 @@ class ToolManager:
     def to_params(self) -> List[Dict[str, Any]]:
         return [tool.to_param() for tool in self.tools]
 
+    @property
+    def cached_params(self) -> List[Dict[str, Any]]:
+        """`to_params()` memoized on `version`. Treat the result as read-only."""
+        cache = self._params_cache
+        if cache is not None and cache[0] == self._version:
+            return cache[1]
+        params = self.to_params()
+        # MCP tools rewrite their own name/schema when they lazy-load, without
+        # bumping the version, so only memoize once every one has loaded
+        if all(getattr(tool, '_parameters_loaded', True) for tool in self.mcp_tools):
+            self._params_cache = (self._version, params)
+        return params
+
     async def execute(self, * ,name: str, tool_input: Dict[str, Any] =None) -> ToolResult:
         tool = self.tool_map[name]
         if not tool:
@@ -70,6 +123,7 @@ class ToolManager:
     def add_tool(self, tool: BaseTool) -> None:
         self.tools.append(tool)
         self.tool_map[tool.name] = tool
+        self.mark_dirty()
 
     def add_tools(self, *tools: BaseTool) -> None:
         for tool in tools:
@@ -78,6 +132,7 @@ class ToolManager:
     def remove_tool(self, name: str) -> None:
         self.tools = [tool for tool in self.tools if tool.name != name]
         del self.tool_map[name]
+        self.mark_dirty()
 
     def index_tools(self):
         self._lazy_init_pinecone()
@@ -0,0 +1,199 @@
+"""
+Tests for CallbackManager dispatch and token batching.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from spoon_ai.callbacks import (
+    NOOP,
+    AsyncCallbackHandler,
+    BaseCallbackHandler,
+    CallbackManager,
+    StreamingStatisticsCallback,
+    StreamingStdOutCallbackHandler,
+)
+
+
+class RecordingHandler(AsyncCallbackHandler):
+    def __init__(self):
+        self.events = []
+
+    async def on_llm_new_token(self, token, **kwargs):
+        self.events.append(("token", token))
+
+    async def on_llm_end(self, response, **kwargs):
+        self.events.append(("end", response))
+
+
+class BatchingHandler(RecordingHandler):
+    async def on_llm_new_token_batch(self, tokens, *, chunks, **kwargs):
+        self.events.append(("batch", tokens, len(chunks)))
+
+
+class SyncHandler(BaseCallbackHandler):
+    run_inline = True
+
+    def __init__(self):
+        self.tokens = []
+
+    def on_llm_new_token(self, token, **kwargs):
+        self.tokens.append(token)
+
+
+class TestDispatch:
+    async def test_skips_handlers_without_hook(self):
+        handler = RecordingHandler()
+        manager = CallbackManager([handler, SyncHandler()])
+        assert manager._handlers_for("on_tool_start") == []
+        assert manager._handlers_for("on_llm_end") == [handler]
+
+    async def test_handler_list_edits_are_seen(self):
+        first, second = RecordingHandler(), RecordingHandler()
+        manager = CallbackManager([first])
+        await manager.on_llm_new_token("a", run_id=uuid4())
+
+        # Same length, different handler
+        manager.handlers[0] = second
+        await manager.on_llm_new_token("b", run_id=uuid4())
+
+        manager.handlers.remove(second)
+        manager.handlers.append(first)
+        await manager.on_llm_new_token("c", run_id=uuid4())
+
+        assert first.events == [("token", "a"), ("token", "c")]
+        assert second.events == [("token", "b")]
+
+    async def test_instance_assigned_hook(self):
+        handler = SyncHandler()
+        seen = []
+        handler.on_llm_end = lambda response, **kwargs: seen.append(response)
+        manager = CallbackManager([handler])
+
+        await manager.on_llm_end("done", run_id=uuid4())
+
+        assert seen == ["done"]
+
+    async def test_sync_handler_runs_inline(self):
+        handler = SyncHandler()
+        manager = CallbackManager([handler])
+        for token in "abc":
+            await manager.on_llm_new_token(token, run_id=uuid4())
+        assert handler.tokens == ["a", "b", "c"]
+
+
+class TestBuiltinHandlers:
+    async def test_stdout_handler_accepts_instance_settings(self):
+        handler = StreamingStdOutCallbackHandler()
+        handler.raise_error = True
+        handler.run_inline = False
+        seen = []
+        handler.on_llm_end = lambda response, **kwargs: seen.append(response)
+
+        await CallbackManager([handler]).on_llm_end("done", run_id=uuid4())
+
+        assert handler.raise_error and not handler.run_inline
+        assert StreamingStdOutCallbackHandler.run_inline is True
+        assert seen == ["done"]
+
+    async def test_statistics_callback_accepts_instance_settings(self):
+        callback = StreamingStatisticsCallback(auto_print=False)
+        callback.raise_error = True
+        callback.run_inline = True
+        assert callback.raise_error and callback.run_inline
+
+
+class TestTokenBatching:
+    async def test_batches_by_size_and_flushes_on_end(self):
+        batching, plain = BatchingHandler(), RecordingHandler()
+        manager = CallbackManager([batching, plain], token_batch_size=3)
+        run_id = uuid4()
+
+        for token in "abcd":
+            await manager.on_llm_new_token(token, run_id=run_id)
+        await manager.on_llm_end("resp", run_id=run_id)
+
+        assert batching.events == [("batch", "abc", 3), ("batch", "d", 1), ("end", "resp")]
+        # Handlers without a batch hook still see every token, in order
+        assert plain.events == [("token", t) for t in "abcd"] + [("end", "resp")]
+
+    async def test_new_run_id_starts_new_batch(self):
+        handler = BatchingHandler()
+        manager = CallbackManager([handler], token_batch_size=10)
+        first, second = uuid4(), uuid4()
+
+        await manager.on_llm_new_token("a", run_id=first)
+        await manager.on_llm_new_token("b", run_id=second)
+        await manager.on_llm_end("resp", run_id=second)
+
+        assert handler.events[:2] == [("batch", "a", 1), ("batch", "b", 1)]
+
+    async def test_window_flushes_partial_batch(self):
+        handler = BatchingHandler()
+        manager = CallbackManager([handler], token_batch_size=10, token_batch_window_ms=10)
+
+        await manager.on_llm_new_token("a", run_id=uuid4())
+        assert handler.events == []
+        await asyncio.sleep(0.05)
+
+        assert handler.events == [("batch", "a", 1)]
+
+
+class TestFromCallbacks:
+    async def test_none_gives_an_owned_manager(self):
+        first = CallbackManager.from_callbacks(None)
+        second = CallbackManager.from_callbacks(None)
+        assert first is not second
+
+        handler = RecordingHandler()
+        first.handlers.append(handler)
+        await first.on_llm_end("done", run_id=uuid4())
+
+        assert handler.events == [("end", "done")]
+        assert second.handlers == []
+        assert NOOP.handlers == ()
+
+    async def test_noop_merge(self):
+        assert NOOP.merge([]) is NOOP
+        handler = RecordingHandler()
+        merged = NOOP.merge(handler)
+        assert merged is not NOOP
+        assert merged.handlers == [handler]
+        await NOOP.on_llm_end("ignored", run_id=uuid4())
+        assert handler.events == []
+
+
+async def _one_chunk():
+    delta = SimpleNamespace(content="hi", tool_calls=None)
+    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason="stop")], usage=None)
+
+
+class TestProviderCallSites:
+    async def _stream(self, callbacks):
+        pytest.importorskip("openai")
+        from spoon_ai.llm.providers import openai_compatible_provider
+        from spoon_ai.schema import Message
+
+        provider = openai_compatible_provider.OpenAICompatibleProvider()
+        create = AsyncMock(return_value=_one_chunk())
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        with patch.object(
+            openai_compatible_provider.CallbackManager, "from_callbacks", wraps=CallbackManager.from_callbacks
+        ) as from_callbacks:
+            async for _ in provider.chat_stream([Message(role="user", content="hi")], callbacks=callbacks):
+                pass
+        return from_callbacks
+
+    async def test_no_callbacks_uses_noop(self):
+        from_callbacks = await self._stream(None)
+        from_callbacks.assert_not_called()
+
+    async def test_callbacks_get_a_manager(self):
+        handler = RecordingHandler()
+        from_callbacks = await self._stream([handler])
+        from_callbacks.assert_called_once_with([handler])
+        assert [event for event, _ in handler.events] == ["token", "end"]
@@ -0,0 +1,83 @@
+"""
+Tests for CustomAgent's tool bookkeeping.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("fastmcp")
+
+from spoon_ai.agents.custom_agent import CustomAgent
+from spoon_ai.chat import ChatBot
+from spoon_ai.tools.base import BaseTool
+
+
+class EchoTool(BaseTool):
+    name: str = "echo"
+    description: str = "Echo the input"
+    parameters: dict = {"type": "object", "properties": {"text": {"type": "string"}}}
+
+    async def execute(self, text: str = "") -> str:
+        return text
+
+
+@pytest.fixture
+def agent():
+    return CustomAgent(llm=Mock(spec=ChatBot))
+
+
+class TestToolValidation:
+    async def test_same_size_swap_is_revalidated(self, agent):
+        agent.add_tool(EchoTool())
+        agent.validate_tools = Mock(wraps=agent.validate_tools)
+        agent.state = "not idle"  # stop run() before it reaches the LLM
+        agent.clear = Mock(side_effect=RuntimeError("stop"))
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError, match="stop"):
+                await agent.run("hi")
+        # Validated once, then reused while the tools are unchanged
+        assert agent.validate_tools.call_count == 1
+
+        # Replace the tool behind the agent's back, keeping the count
+        manager = agent.available_tools
+        manager.remove_tool("echo")
+        manager.add_tool(SimpleNamespace(name="bogus"))
+
+        with pytest.raises(RuntimeError, match="invalid tools: bogus"):
+            await agent.run("hi")
+        assert agent.validate_tools.call_count == 2
+
+    def test_assigning_tools_bumps_manager_version(self, agent):
+        manager = agent.available_tools
+        version = manager.version
+        manager.tools = [EchoTool()]
+        assert manager.version > version
+        version = manager.version
+        manager.tool_map = {"echo": manager.tools[0]}
+        assert manager.version > version
+
+
+class TestToolListing:
+    def test_list_tools_follows_the_tool_list(self, agent):
+        agent.add_tools([EchoTool(), EchoTool(name="shout")])
+        assert agent.list_tools() == ["echo", "shout"]
+
+        # A tool renamed after registration is listed under its current name
+        agent.available_tools.tools[1].name = "yell"
+        assert agent.list_tools() == ["echo", "yell"]
+
+    def test_get_tool_info_tolerates_partial_tools(self, agent):
+        agent.add_tool(EchoTool())
+        agent.available_tools.tools.append(SimpleNamespace(name="bare"))
+
+        info = agent.get_tool_info()
+        assert info["echo"]["type"] == "EchoTool"
+        assert info["bare"] == {
+            "description": "No description",
+            "parameters": {},
+            "type": "SimpleNamespace",
+        }
@@ -0,0 +1,271 @@
+"""
+Tests for the persistent Memory used by GraphAgent.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import TypedDict
+from unittest.mock import Mock
+
+import pytest
+
+from spoon_ai.graph import END, GraphExecutionError, StateGraph
+from spoon_ai.graph import agent as graph_agent
+from spoon_ai.graph.agent import GraphAgent, Memory
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return Memory(storage_path=str(tmp_path), session_id="test")
+
+
+class TestMemoryLog:
+    def test_messages_round_trip_through_the_log(self, tmp_path, memory):
+        memory.add_message({"role": "user", "content": "hello"})
+        memory.add_message({"role": "assistant", "content": "hi", "extra": [1, 2]})
+        memory.set_metadata("topic", "greetings")
+        memory.close()
+
+        lines = (tmp_path / "test.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["content"] for line in lines] == ["hello", "hi"]
+
+        reloaded = Memory(storage_path=str(tmp_path), session_id="test")
+        assert reloaded.get_messages() == memory.get_messages()
+        assert reloaded.get_metadata("topic") == "greetings"
+
+    def test_appends_only_new_messages(self, tmp_path, memory):
+        memory.add_message({"role": "user", "content": "one"})
+        log = tmp_path / "test.jsonl"
+        first = log.read_bytes()
+
+        memory.add_message({"role": "user", "content": "two"})
+        assert log.read_bytes().startswith(first)
+        assert len(log.read_bytes().splitlines()) == 2
+
+    def test_clear_rewrites_the_log(self, tmp_path, memory):
+        memory.add_message({"role": "user", "content": "one"})
+        memory.clear()
+        memory.add_message({"role": "user", "content": "two"})
+        memory.close()
+
+        reloaded = Memory(storage_path=str(tmp_path), session_id="test")
+        assert [m["content"] for m in reloaded.get_messages()] == ["two"]
+
+    def test_migrates_legacy_session_file(self, tmp_path):
+        legacy = {
+            "messages": [{"role": "user", "content": "old", "timestamp": "2024-01-01T00:00:00"}],
+            "metadata": {"topic": "legacy"},
+        }
+        (tmp_path / "old.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        memory = Memory(storage_path=str(tmp_path), session_id="old")
+        assert memory.get_messages() == legacy["messages"]
+        assert memory.get_metadata("topic") == "legacy"
+
+        memory.add_message({"role": "user", "content": "new"})
+        memory.close()
+        reloaded = Memory(storage_path=str(tmp_path), session_id="old")
+        assert [m["content"] for m in reloaded.get_messages()] == ["old", "new"]
+        assert reloaded.get_metadata("topic") == "legacy"
+
+
+def _logged(path):
+    if not path.exists():
+        return []
+    return [json.loads(line)["content"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestMemoryDebouncedFlush:
+    async def test_writes_are_coalesced_in_a_loop(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="test", flush_delay=0.05)
+        for i in range(3):
+            memory.add_message({"role": "user", "content": str(i)})
+        assert _logged(tmp_path / "test.jsonl") == []
+
+        await asyncio.sleep(0.2)
+        assert _logged(tmp_path / "test.jsonl") == ["0", "1", "2"]
+        memory.close()
+
+    async def test_flush_writes_immediately(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="test", flush_delay=60)
+        memory.add_message({"role": "user", "content": "now"})
+        memory.flush()
+        assert _logged(tmp_path / "test.jsonl") == ["now"]
+        memory.close()
+
+    async def test_aflush_writes_from_a_worker(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="test", flush_delay=60)
+        memory.add_message({"role": "user", "content": "later"})
+        await memory.aflush()
+        assert _logged(tmp_path / "test.jsonl") == ["later"]
+        assert memory not in graph_agent._PENDING_FLUSH
+        memory.close()
+
+    async def test_exit_hook_flushes_pending_writes(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="test", flush_delay=60)
+        memory.add_message({"role": "user", "content": "pending"})
+        assert memory in graph_agent._PENDING_FLUSH
+
+        graph_agent._flush_pending_memories()
+        assert _logged(tmp_path / "test.jsonl") == ["pending"]
+        memory.close()
+
+
+class TestMemoryClear:
+    def test_messages_held_past_clear_are_untouched(self, memory):
+        memory.add_message({"role": "user", "content": "first"})
+        held = memory.get_messages()
+        kept = held[0]
+
+        memory.clear()
+        memory.add_message({"role": "user", "content": "second"})
+
+        assert kept["content"] == "first"
+        assert [m["content"] for m in held] == ["first"]
+        assert [m["content"] for m in memory.get_messages()] == ["second"]
+
+    def test_add_message_copies_its_input(self, memory):
+        source = {"role": "user", "content": "hi"}
+        memory.add_message(source)
+        source["content"] = "changed"
+        assert memory.get_messages()[0]["content"] == "hi"
+        assert "timestamp" not in source
+
+
+class TestMemoryGetMessages:
+    def test_live_list_and_copies(self, memory):
+        memory.add_message({"role": "user", "content": "one"})
+        live = memory.get_messages()
+        own = memory.get_messages(copy=True)
+
+        memory.add_message({"role": "user", "content": "two"})
+        assert live is memory.get_messages()
+        assert [m["content"] for m in live] == ["one", "two"]
+        assert [m["content"] for m in own] == ["one"]
+
+        own.clear()
+        assert len(memory.get_messages()) == 2
+        assert [m["content"] for m in memory.get_messages(limit=1)] == ["two"]
+
+
+class TestMemoryBulkReplace:
+    def test_matches_clear_then_add(self, tmp_path, memory):
+        memory.add_message({"role": "user", "content": "old"})
+        source = {"role": "user", "content": "new"}
+        memory.bulk_replace([source, {"role": "assistant", "content": "kept", "timestamp": "2024-01-01T00:00:00"}])
+
+        messages = memory.get_messages()
+        assert [m["content"] for m in messages] == ["new", "kept"]
+        assert "timestamp" in messages[0] and "timestamp" not in source
+        assert messages[1]["timestamp"] == "2024-01-01T00:00:00"
+
+        memory.close()
+        assert _logged(tmp_path / "test.jsonl") == ["new", "kept"]
+
+
+def _hours_ago(hours):
+    return (datetime.now() - timedelta(hours=hours)).isoformat()
+
+
+class TestMemoryRecentMessages:
+    def test_time_ordered_messages(self, memory):
+        for hours, content in [(30, "old"), (2, "recent")]:
+            memory.add_message({"role": "user", "content": content, "timestamp": _hours_ago(hours)})
+        assert [m["content"] for m in memory.get_recent_messages()] == ["recent"]
+
+        # Messages appended after a lookup are seen by the next one
+        memory.add_message({"role": "user", "content": "now"})
+        assert [m["content"] for m in memory.get_recent_messages()] == ["recent", "now"]
+        assert [m["content"] for m in memory.get_recent_messages(hours=48)] == ["old", "recent", "now"]
+
+    def test_out_of_order_and_unparseable_timestamps(self, memory):
+        for timestamp, content in [
+            (_hours_ago(2), "recent"),
+            (_hours_ago(30), "old"),
+            ("not a time", "unknown"),
+            (_hours_ago(1), "newer"),
+        ]:
+            memory.add_message({"role": "user", "content": content, "timestamp": timestamp})
+        assert [m["content"] for m in memory.get_recent_messages()] == ["recent", "unknown", "newer"]
+
+    def test_replaced_messages_are_reparsed(self, memory):
+        memory.add_message({"role": "user", "content": "recent", "timestamp": _hours_ago(1)})
+        assert len(memory.get_recent_messages()) == 1
+
+        memory.bulk_replace([{"role": "user", "content": "old", "timestamp": _hours_ago(30)}])
+        assert memory.get_recent_messages() == []
+
+
+class TestMemorySearch:
+    def test_matches_substrings_most_recent_first(self, memory):
+        for content in ["concatenate the lists", "a cat sat", "dog days", "Scattered CATS"]:
+            memory.add_message({"role": "user", "content": content})
+
+        found = [m["content"] for m in memory.search_messages("cat")]
+        assert found == ["Scattered CATS", "a cat sat", "concatenate the lists"]
+        assert [m["content"] for m in memory.search_messages("cat sat")] == ["a cat sat"]
+        assert [m["content"] for m in memory.search_messages("t s")] == ["a cat sat"]
+        assert memory.search_messages("bird") == []
+
+    def test_limit(self, memory):
+        for i in range(5):
+            memory.add_message({"role": "user", "content": f"note {i}"})
+        assert [m["content"] for m in memory.search_messages("note", limit=2)] == ["note 4", "note 3"]
+
+    def test_sees_new_and_replaced_messages(self, memory):
+        memory.add_message({"role": "user", "content": "alpha"})
+        assert len(memory.search_messages("alpha")) == 1
+
+        memory.add_message({"role": "user", "content": "alphabet"})
+        assert len(memory.search_messages("alpha")) == 2
+
+        memory.bulk_replace([{"role": "user", "content": "beta"}])
+        assert memory.search_messages("alpha") == []
+        assert [m["content"] for m in memory.search_messages("bet")] == ["beta"]
+
+
+class CounterState(TypedDict, total=False):
+    input: str
+    output: str
+    count: int
+
+
+def _counter_graph(fail_at):
+    def count(state):
+        total = (state.get("count") or 0) + 1
+        if total == fail_at:
+            raise ValueError("boom")
+        return {"output": f"run {total}", "count": total}
+
+    graph = StateGraph(CounterState)
+    graph.add_node("count", count)
+    graph.set_entry_point("count")
+    graph.add_edge("count", END)
+    return graph
+
+
+class TestGraphAgentRecovery:
+    async def test_checkpoint_is_only_built_on_failure(self, tmp_path):
+        agent = GraphAgent("test", _counter_graph(fail_at=2), preserve_state=True, memory_path=str(tmp_path))
+        agent._create_checkpoint = Mock(side_effect=AssertionError("eager checkpoint"))
+
+        assert await agent.run("hi") == "run 1"
+        assert agent._last_state["count"] == 1
+
+        agent.current_step = 3
+        with pytest.raises(GraphExecutionError, match="Node 'count' failed") as raised:
+            await agent.run("again")
+        cause = raised.value
+        while cause.__cause__ is not None:
+            cause = cause.__cause__
+        assert isinstance(cause, ValueError) and str(cause) == "boom"
+
+        # The failed run is rolled back to the state from before it
+        assert agent._last_state["count"] == 1
+        assert agent._last_state["output"] == "run 1"
+        assert agent.current_step == 3
+        assert agent.state == "IDLE"
+        assert agent.execution_metadata["execution_successful"] is False
+        agent._create_checkpoint.assert_not_called()
+        agent.memory.close()
@@ -0,0 +1,120 @@
+"""
+Tests for MCPClientMixin's shared-session leasing.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from spoon_ai.agents.mcp_client_mixin import MCPClientMixin
+
+
+class FakeClient:
+    """Stands in for fastmcp's Client: counts connects, no server needed."""
+
+    def __init__(self):
+        self.connects = 0
+        self.connected = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def __aenter__(self):
+        self.connects += 1
+        self.connected = True
+        return object()
+
+    async def __aexit__(self, *exc_info):
+        self.connected = False
+
+
+def _mixin():
+    with patch("spoon_ai.agents.mcp_client_mixin.MCPClient", lambda transport: FakeClient()):
+        return MCPClientMixin(None)
+
+
+class TestSessionLeases:
+    async def test_nested_get_session_reuses_lease(self):
+        mixin = _mixin()
+        async with mixin.get_session() as outer:
+            async with mixin.get_session() as inner:
+                assert inner is outer
+        assert mixin.get_session_stats()["created"] == 1
+        assert mixin._client.connects == 1
+        await mixin.cleanup()
+
+    async def test_leases_are_per_client(self):
+        first, second = _mixin(), _mixin()
+        async with first.get_session() as a:
+            async with second.get_session() as b:
+                assert a is not b
+        assert first.get_session_stats()["created"] == 1
+        assert second.get_session_stats()["created"] == 1
+        await first.cleanup()
+        await second.cleanup()
+
+    async def test_concurrent_tasks_share_connection(self):
+        mixin = _mixin()
+
+        async def use():
+            async with mixin.get_session() as session:
+                await asyncio.sleep(0)
+                return session
+
+        sessions = await asyncio.gather(*(use() for _ in range(5)))
+        assert len({id(s) for s in sessions}) == 1
+        assert mixin._client.connects == 1
+        await mixin.cleanup()
+
+    def test_separate_event_loops(self):
+        mixin = _mixin()
+
+        async def use():
+            async with mixin.get_session() as session:
+                return session, mixin._client, mixin._reaper_handle
+
+        first_session, first_client, first_reaper = asyncio.run(use())
+        second_session, second_client, second_reaper = asyncio.run(use())
+
+        # The second loop gets its own connection and a live reaper timer
+        assert second_client is not first_client
+        assert second_session is not first_session
+        assert first_reaper.cancelled()
+        assert second_reaper is not None and not second_reaper.cancelled()
+        asyncio.run(mixin.cleanup())
+
+
+class TestPendingCleanup:
+    async def test_task_finishing_after_a_drain_is_reaped(self):
+        mixin = _mixin()
+        held = []
+        release = asyncio.Event()
+
+        async def lease(wait):
+            # Enter without exiting, as an abandoned session would
+            session = mixin.get_session()
+            await session.__aenter__()
+            held.append(session)
+            if wait:
+                await release.wait()
+
+        first = asyncio.create_task(lease(wait=False))
+        second = asyncio.create_task(lease(wait=True))
+        await first
+        await asyncio.sleep(0)
+        await mixin._drain_pending_cleanup()
+        assert first not in mixin._task_sessions
+        assert second in mixin._task_sessions
+
+        release.set()
+        await second
+        await asyncio.sleep(0)
+        assert second in mixin._pending_cleanup
+
+        await mixin._drain_pending_cleanup()
+        assert len(mixin._task_sessions) == 0
+        assert mixin.get_session_stats()["active"] == 0
+        await mixin.cleanup()
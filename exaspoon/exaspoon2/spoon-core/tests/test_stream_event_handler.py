@@ -0,0 +1,63 @@
+"""
+Tests for StreamEventCallbackHandler.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from spoon_ai.callbacks import StreamEventCallbackHandler
+
+
+def _drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+class TestStreamEventHandler:
+    async def test_requires_unbounded_queue(self):
+        with pytest.raises(ValueError):
+            StreamEventCallbackHandler(asyncio.Queue(maxsize=1), root_run_id=uuid4())
+
+    async def test_events_of_a_run_do_not_share_containers(self):
+        queue = asyncio.Queue()
+        root, run_id = uuid4(), uuid4()
+        handler = StreamEventCallbackHandler(queue, root_run_id=root, metadata={"session": "s1"})
+
+        await handler.on_llm_start(run_id, [], model="gpt", provider="openai")
+        await handler.on_llm_new_token("a", run_id=run_id)
+        await handler.on_llm_new_token("b", run_id=run_id)
+        await handler.on_llm_end({"text": "ab"}, run_id=run_id)
+        start, first, second, end = _drain(queue)
+
+        first["metadata"]["mutated"] = True
+        first["parent_ids"].append("other")
+
+        for event in (start, second, end):
+            assert event["metadata"] == {"session": "s1", "model": "gpt", "provider": "openai"}
+            assert event["parent_ids"] == [str(root)]
+        assert [first["data"]["token"], second["data"]["token"]] == ["a", "b"]
+
+    async def test_chunk_payload_can_be_disabled(self):
+        queue = asyncio.Queue()
+        run_id = uuid4()
+        chunk = SimpleNamespace(model_dump=lambda: {"delta": "a"})
+
+        handler = StreamEventCallbackHandler(queue, root_run_id=uuid4())
+        await handler.on_llm_new_token("a", chunk=chunk, run_id=run_id)
+        handler = StreamEventCallbackHandler(queue, root_run_id=uuid4(), serialize_chunks=False)
+        await handler.on_llm_new_token("a", chunk=chunk, run_id=run_id)
+
+        with_chunk, without_chunk = _drain(queue)
+        assert with_chunk["data"]["chunk"] == {"delta": "a"}
+        assert "chunk" not in without_chunk["data"]
+
+    async def test_per_instance_flags(self):
+        handler = StreamEventCallbackHandler(asyncio.Queue(), root_run_id=uuid4())
+        handler.raise_error = True
+        handler.run_inline = True
+        assert handler.raise_error and handler.run_inline
@@ -0,0 +1,67 @@
+"""
+Tests for ToolManager's memoized tool parameters.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+pytest.importorskip("openai")
+pytest.importorskip("fastmcp")
+
+from spoon_ai.tools.base import BaseTool
+from spoon_ai.tools.mcp_tool import MCPTool
+from spoon_ai.tools.tool_manager import ToolManager
+
+
+class EchoTool(BaseTool):
+    name: str = "echo"
+    description: str = "Echo the input"
+    parameters: dict = {"type": "object", "properties": {"text": {"type": "string"}}}
+
+    async def execute(self, text: str = "") -> str:
+        return text
+
+
+def _lazy_mcp_tool(server_tools):
+    tool = MCPTool(name="placeholder", mcp_config={"url": "http://localhost:8765/sse"})
+    session = SimpleNamespace(list_tools=AsyncMock(return_value=server_tools))
+
+    @asynccontextmanager
+    async def get_session():
+        yield session
+
+    object.__setattr__(tool, "_check_mcp_health", AsyncMock(return_value=True))
+    object.__setattr__(tool, "get_session", get_session)
+    return tool
+
+
+class TestCachedParams:
+    def test_memoized_until_mutation(self):
+        manager = ToolManager([EchoTool()])
+        params = manager.cached_params
+        assert manager.cached_params is params
+
+        manager.add_tool(EchoTool(name="echo2"))
+        assert manager.cached_params is not params
+        assert [p["function"]["name"] for p in manager.cached_params] == ["echo", "echo2"]
+
+    async def test_reflects_mcp_tool_lazy_load(self):
+        schema = {"type": "object", "properties": {"query": {"type": "string"}}}
+        tool = _lazy_mcp_tool([SimpleNamespace(name="search", inputSchema=schema, description="Search docs")])
+        manager = ToolManager([EchoTool(), tool])
+
+        before = manager.cached_params
+        assert before[1]["function"]["name"] == "placeholder"
+
+        await tool.ensure_parameters_loaded()
+
+        after = manager.cached_params
+        assert after[1]["function"] == {
+            "name": "search",
+            "description": "Search docs",
+            "parameters": schema,
+        }
+        # Everything has loaded now, so the result is memoized again
+        assert manager.cached_params is after
@@ -0,0 +1,192 @@
+"""
+Tests for ToolCallAgent's tool execution and output events.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("fastmcp")
+
+from spoon_ai.agents.toolcall import ToolCallAgent
+from spoon_ai.chat import ChatBot
+from spoon_ai.schema import Function, LLMResponse, ToolCall
+from spoon_ai.tools import ToolManager
+from spoon_ai.tools.base import BaseTool
+
+
+class CountingTool(BaseTool):
+    name: str = "lookup"
+    description: str = "Look a key up"
+    parameters: dict = {"type": "object", "properties": {"key": {"type": "string"}}}
+    calls: int = 0
+
+    async def execute(self, key: str = "", **kwargs) -> str:
+        self.calls += 1
+        return f"value of {key}" if key != "missing" else ""
+
+
+class SlowTool(BaseTool):
+    name: str = "slow"
+    description: str = "Sleep, then echo"
+    parameters: dict = {"type": "object", "properties": {"text": {"type": "string"}}}
+    running: int = 0
+    peak: int = 0
+
+    async def execute(self, text: str = "") -> str:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.02)
+        self.running -= 1
+        return text
+
+
+def _call(name, arguments, call_id="call_1"):
+    return ToolCall(id=call_id, function=Function(name=name, arguments=arguments))
+
+
+def _agent(*tools, **kwargs):
+    return ToolCallAgent(name="test_agent", llm=Mock(spec=ChatBot), available_tools=ToolManager(list(tools)), **kwargs)
+
+
+class TestParallelAct:
+    async def test_calls_run_concurrently_in_order(self):
+        tool = SlowTool()
+        agent = _agent(tool, max_parallel_tools=2)
+        agent.tool_calls = [_call("slow", f'{{"text": "{text}"}}', f"call_{text}") for text in "abc"]
+
+        results = (await agent.act()).split("\n\n")
+        assert [result[-1] for result in results] == ["a", "b", "c"]
+        assert tool.peak == 2
+        tool_messages = [m for m in agent.memory.messages if m.role == "tool"]
+        assert [m.tool_call_id for m in tool_messages] == ["call_a", "call_b", "call_c"]
+
+    async def test_failure_keeps_its_slot(self):
+        agent = _agent(SlowTool())
+        execute = agent.available_tools.execute
+
+        async def failing_execute(name, tool_input):
+            if tool_input["text"] == "fail":
+                raise ValueError("bad input")
+            return await execute(name=name, tool_input=tool_input)
+
+        agent.available_tools.execute = failing_execute
+        agent.tool_calls = [
+            _call("slow", '{"text": "ok"}', "call_ok"),
+            _call("slow", '{"text": "fail"}', "call_fail"),
+        ]
+
+        result = await agent.act()
+
+        first, second = result.split("\n\n")
+        assert first.endswith("ok")
+        assert "bad input" in second
+        assert "bad input" in agent.last_tool_error
+        tool_messages = [m for m in agent.memory.messages if m.role == "tool"]
+        assert [m.tool_call_id for m in tool_messages] == ["call_ok", "call_fail"]
+
+
+class TestToolResultCache:
+    async def test_identical_calls_hit_the_cache(self):
+        tool = CountingTool()
+        agent = _agent(tool, tool_cache_enabled=True)
+
+        first = await agent.execute_tool(_call("lookup", '{"key": "a", "n": 1}'))
+        second = await agent.execute_tool(_call("lookup", '{"n": 1, "key": "a"}'))
+        assert first == second
+        assert tool.calls == 1
+
+        await agent.execute_tool(_call("lookup", '{"key": "b"}'))
+        assert tool.calls == 2
+
+        agent.clear()
+        await agent.execute_tool(_call("lookup", '{"key": "a", "n": 1}'))
+        assert tool.calls == 3
+
+    async def test_disabled_exempt_and_empty_results_are_not_cached(self):
+        for kwargs, arguments in [
+            ({}, '{"key": "a"}'),
+            ({"tool_cache_enabled": True, "tool_cache_exempt": {"lookup"}}, '{"key": "a"}'),
+            ({"tool_cache_enabled": True}, '{"key": "missing"}'),
+        ]:
+            tool = CountingTool()
+            agent = _agent(tool, **kwargs)
+            await agent.execute_tool(_call("lookup", arguments))
+            await agent.execute_tool(_call("lookup", arguments))
+            assert tool.calls == 2, kwargs
+
+    async def test_entries_expire_and_are_bounded(self):
+        tool = CountingTool()
+        agent = _agent(tool, tool_cache_enabled=True, tool_cache_max=1, tool_cache_ttl=0)
+        await agent.execute_tool(_call("lookup", '{"key": "a"}'))
+        await agent.execute_tool(_call("lookup", '{"key": "a"}'))
+        assert tool.calls == 2
+
+        agent.tool_cache_ttl = 60
+        agent._tool_result_cache.clear()
+        for key in "aba":
+            await agent.execute_tool(_call("lookup", f'{{"key": "{key}"}}'))
+        # With room for one entry, "b" evicted "a"
+        assert tool.calls == 5
+        assert len(agent._tool_result_cache) == 1
+
+
+def _drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+class TestOutputEvents:
+    async def _think(self, **kwargs):
+        agent = _agent(CountingTool(), **kwargs)
+        tool_calls = [_call("lookup", '{"key": "a"}')]
+        agent.llm.ask_tool = AsyncMock(
+            return_value=LLMResponse(content="checking", tool_calls=tool_calls, finish_reason="tool_calls")
+        )
+        agent.current_step = 2
+        await agent.think()
+        return _drain(agent.output_queue), tool_calls
+
+    async def test_one_event_per_step(self):
+        events, tool_calls = await self._think()
+        assert events == [{"content": "checking", "tool_calls": tool_calls, "step": 2}]
+
+    async def test_split_events(self):
+        events, tool_calls = await self._think(split_output_events=True)
+        assert events == [{"content": "checking"}, {"tool_calls": tool_calls}]
+
+
+class ServerToolsAgent(ToolCallAgent):
+    server_tools: list = []
+    fetches: int = 0
+
+    async def list_mcp_tools(self):
+        self.fetches += 1
+        return self.server_tools
+
+
+class TestMCPToolsCache:
+    async def test_large_catalog_is_returned_whole_but_not_cached(self):
+        # Same-named tools from different servers are both kept
+        tools = [SimpleNamespace(name=f"tool_{i % 4}") for i in range(6)]
+        agent = ServerToolsAgent(
+            name="test_agent", llm=Mock(spec=ChatBot), server_tools=tools, mcp_tools_cache_max=4
+        )
+
+        assert list(await agent._get_cached_mcp_tools()) == tools
+        assert list(await agent._get_cached_mcp_tools()) == tools
+        assert agent.fetches == 2
+        assert agent.mcp_tools_cache is None
+
+    async def test_small_catalog_is_cached(self):
+        tools = [SimpleNamespace(name=f"tool_{i}") for i in range(3)]
+        agent = ServerToolsAgent(name="test_agent", llm=Mock(spec=ChatBot), server_tools=tools)
+
+        assert list(await agent._get_cached_mcp_tools()) == tools
+        assert list(await agent._get_cached_mcp_tools()) == tools
+        assert agent.fetches == 1
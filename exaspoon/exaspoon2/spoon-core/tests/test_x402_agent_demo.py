@@ -0,0 +1,65 @@
+"""
+Tests for helpers in the x402 agent demo.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+pytest.importorskip("x402")
+pytest.importorskip("eth_account")
+
+from examples import x402_agent_demo
+from examples.x402_agent_demo import parse_tool_output
+
+
+class TestParseToolOutput:
+    def test_json_output(self):
+        assert parse_tool_output('Output: {"status": 402, "ok": false}') == {"status": 402, "ok": False}
+
+    def test_python_repr_output(self):
+        assert parse_tool_output("Output: {'status': 200, 'body': 'paid'}") == {"status": 200, "body": "paid"}
+        assert parse_tool_output("Output: {'ok': True, 'data': None}") == {"ok": True, "data": None}
+
+    def test_apostrophes_inside_strings(self):
+        # repr() switches to double quotes for strings holding an apostrophe;
+        # a blind quote swap would split this into two elements
+        value = ["x", "a', 'b"]
+        assert parse_tool_output(f"Output: {value!r}") == value
+        value = {"note": "it's paid", "to": 'say "hi"'}
+        assert parse_tool_output(f"Output: {value!r}") == value
+
+    def test_unparseable_output_is_returned_as_text(self):
+        assert parse_tool_output("Output: not a payload") == "not a payload"
+
+
+class TestMainStartup:
+    async def test_failed_initialize_reaps_probe_task(self):
+        probe_cancelled = asyncio.Event()
+
+        async def slow_probe(**kwargs):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                probe_cancelled.set()
+                raise
+
+        async def failing_initialize():
+            await asyncio.sleep(0)  # let the probe start
+            raise RuntimeError("no signer")
+
+        agent = SimpleNamespace(
+            http_probe_tool=SimpleNamespace(execute=slow_probe),
+            initialize=failing_initialize,
+        )
+        with patch.object(x402_agent_demo, "ChatBot", Mock()), \
+                patch.object(x402_agent_demo, "X402PaymentService", Mock()), \
+                patch.object(x402_agent_demo, "X402ReactAgent", Mock(return_value=agent)), \
+                patch.object(x402_agent_demo, "rprint", Mock()):
+            with pytest.raises(RuntimeError, match="no signer"):
+                await x402_agent_demo.main()
+
+        # The probe was awaited through its cancellation, not left pending
+        assert probe_cancelled.is_set()